@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""Compares the FileStorage compression codecs
+
+Usage:
+    ./bench_compression.py [--objects <n>] [--repeat <n>]
+
+Saves and reloads the same objects without compression and with each
+codec, and prints the size of the file and the save and reload
+throughputs, in objects per second.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+
+CODECS = {None: "file.json", "gzip": "file.json.gz", "bz2": "file.json.bz2",
+          "lzma": "file.json.xz"}
+
+
+def best(repeat, run):
+    """returns the shortest time of repeat calls of run"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    """Parse the command line and run the benchmark"""
+    parser = argparse.ArgumentParser(
+        description="Compare the FileStorage compression codecs")
+    parser.add_argument("--objects", type=int, default=50000,
+                        help="number of objects saved")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of runs timed, the best is kept")
+    args = parser.parse_args()
+
+    objects = []
+    for i in range(args.objects):
+        obj = BaseModel.from_dict({"name": f"object {i}", "number": i,
+                                   "price": i * 0.25})
+        objects.append(obj)
+
+    print(f"{'codec':<6} {'bytes':>12} {'ratio':>6} "
+          f"{'save/s':>10} {'reload/s':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        plain = None
+        for codec, name in CODECS.items():
+            path = os.path.join(directory, name)
+            storage = FileStorage(path, fsync=False)
+            for obj in objects:
+                storage.new(obj)
+
+            def save():
+                """rewrite the whole file"""
+                for obj in objects:
+                    storage.new(obj)
+                storage.save()
+
+            saving = best(args.repeat, save)
+            size = os.path.getsize(path)
+            plain = plain or size
+            reloading = best(args.repeat,
+                             FileStorage(path, fsync=False).reload)
+            print(f"{codec or 'none':<6} {size:>12} {plain / size:>6.1f} "
+                  f"{args.objects / saving:>10.0f} "
+                  f"{args.objects / reloading:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
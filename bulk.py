@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""Imports or exports model objects in bulk
+
+Usage:
+    ./bulk.py import <file> [--class <name>] [--format ndjson|csv]
+                            [--chunk-size <n>]
+    ./bulk.py export <file> [--class <name>] [--format ndjson|csv]
+    ./bulk.py convert <store> <new store>
+
+The format is guessed from the file extension (.ndjson, .jsonl or .csv)
+when it isn't given. convert turns a JSON store into a binary one and a
+binary store into a JSON one.
+
+CSV doesn't keep the types of the values: an imported number becomes a
+string, unless the class declares the attribute with a number default.
+Use NDJSON to round-trip objects unchanged.
+"""
+
+import argparse
+
+from models import storage
+from models.engine.binary import convert
+
+
+def main():
+    """Parse the command line and run the import or the export"""
+    parser = argparse.ArgumentParser(
+        description="Import or export model objects in bulk")
+    parser.add_argument("command", choices=["import", "export", "convert"])
+    parser.add_argument("file")
+    parser.add_argument("dst", nargs="?",
+                        help="path to the converted store")
+    parser.add_argument("--class", dest="cls",
+                        help="class of the records or of the objects")
+    parser.add_argument("--format", dest="fmt", choices=["ndjson", "csv"])
+    parser.add_argument("--chunk-size", type=int, default=10000,
+                        help="number of records saved at a time")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "convert":
+            if args.dst is None:
+                parser.error("convert needs the path of the new store")
+            convert(args.file, args.dst)
+            return
+        if args.command == "import":
+            count = storage.import_file(args.file, args.cls, args.fmt,
+                                        args.chunk_size)
+        else:
+            count = storage.export_file(args.file, args.cls, args.fmt)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"** {e} **\n")
+    print(f"{count} objects {args.command}ed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,17 @@
 #!/usr/bin/python3
-"""Creates a unique FileStorage instance for the application"""
+"""Creates a unique storage instance for the application
 
-from models.engine.file_storage import FileStorage
+The storage engine is chosen with the HBNB_TYPE_STORAGE environment
+variable: "db" selects the SQLite DBStorage, anything else the JSON
+FileStorage.
+"""
 
+from os import getenv
 
-storage = FileStorage()
+if getenv("HBNB_TYPE_STORAGE") == "db":
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage()
+else:
+    from models.engine.file_storage import FileStorage
+    storage = FileStorage()
 storage.reload()
@@ -8,10 +8,62 @@ import uuid
 from datetime import datetime
 
 import models
+from models.engine.file_storage import FileStorage
+
+_immutable = (str, int, float, bool, type(None), datetime)
+
+
+class _Timestamp:
+    """Descriptor of a datetime attribute that may be stored as its
+    isoformat text, which is parsed the first time it's read"""
+
+    def __set_name__(self, owner, name):
+        """Remember the name of the attribute"""
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        """returns the datetime, parsing it if it's still text"""
+        if obj is None:
+            return self
+        try:
+            value = obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+        if type(value) is str:
+            try:
+                value = obj.__dict__[self.name] = datetime.fromisoformat(
+                    value)
+            except ValueError:
+                pass
+        return value
+
+    def __set__(self, obj, value):
+        """Store value as is"""
+        obj.__dict__[self.name] = value
+
+    def __delete__(self, obj):
+        """Delete the attribute"""
+        try:
+            del obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
 
 
 class BaseModel:
-    """BaseModel Class"""
+    """BaseModel Class
+
+    Attributes:
+        __cache (dict): the output of to_dict(), until an attribute is set
+            or deleted
+        __text (str): the output of __str__, likewise, when no attribute
+            can change in place
+        _revision (int): number of times an attribute was set or deleted,
+            which tells the storage the object changed since it was saved
+    """
+    __slots__ = ("__dict__", "__weakref__", "__cache", "__text",
+                 "_revision")
+    created_at = _Timestamp()
+    updated_at = _Timestamp()
 
     def __init__(self, *args, **kwargs):
         """__init__ method & instantiation of class Basemodel
@@ -20,9 +72,12 @@ class BaseModel:
             *args.
             **kwargs (dict): Key/value pairs
         """
-        self.id = str(uuid.uuid4())
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        if "id" not in kwargs:
+            self.id = str(uuid.uuid4())
+        if "created_at" not in kwargs:
+            self.created_at = datetime.now()
+        if "updated_at" not in kwargs:
+            self.updated_at = datetime.now()
 
         if kwargs is not None and len(kwargs) > 0:
             for k, v in kwargs.items():
@@ -35,25 +90,99 @@ class BaseModel:
         else:
             models.storage.new(self)
 
+    def __init_subclass__(cls, **kwargs):
+        """Register every model class with the storage"""
+        super().__init_subclass__(**kwargs)
+        FileStorage.register(cls)
+
+    @classmethod
+    def from_dict(cls, attrs, lazy_dates=False):
+        """returns an instance of cls with the attributes of attrs, the
+        output of to_dict(), without running __init__ nor adding it to the
+        storage
+
+        Args:
+            attrs (dict): Key/value pairs, left unchanged
+            lazy_dates (bool): keep created_at and updated_at as text until
+                they are first read
+        """
+        obj = cls.__new__(cls)
+        obj_dict = obj.__dict__
+        if "id" not in attrs:
+            obj_dict["id"] = str(uuid.uuid4())
+        obj_dict.update(attrs)
+        obj_dict.pop("__class__", None)
+        for k in ("created_at", "updated_at"):
+            if k not in obj_dict:
+                obj_dict[k] = datetime.now()
+            elif not lazy_dates and type(obj_dict[k]) is str:
+                obj_dict[k] = datetime.fromisoformat(obj_dict[k])
+        return obj
+
+    def __setattr__(self, name, value):
+        """Set attribute name, drop the cached to_dict() and __str__
+        outputs and count the change"""
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_BaseModel__cache", None)
+        object.__setattr__(self, "_BaseModel__text", None)
+        object.__setattr__(self, "_revision",
+                           getattr(self, "_revision", 0) + 1)
+
+    def __delattr__(self, name):
+        """Delete attribute name, drop the cached to_dict() and __str__
+        outputs and count the change"""
+        object.__delattr__(self, name)
+        object.__setattr__(self, "_BaseModel__cache", None)
+        object.__setattr__(self, "_BaseModel__text", None)
+        object.__setattr__(self, "_revision",
+                           getattr(self, "_revision", 0) + 1)
+
     def save(self):
         """Update updated_at with the current datetime."""
         self.updated_at = datetime.now()
+        models.storage.new(self)
         models.storage.save()
 
     def to_dict(self):
         """
         returns a dictionary containing all
         keys/values of __dict__ of the instance
+
+        The dictionary is built once and copied until an attribute is set
+        or deleted, changes made through __dict__ itself aren't seen.
         """
-        bs_dict = (
-            {
-                k: (v.isoformat() if isinstance(v, datetime) else v)
-                for (k, v) in self.__dict__.items()
-            }
-        )
-        bs_dict["__class__"] = self.__class__.__name__
-        return bs_dict
+        try:
+            bs_dict = self.__cache
+        except AttributeError:
+            bs_dict = None
+        if bs_dict is None:
+            bs_dict = (
+                {
+                    k: (v.isoformat() if isinstance(v, datetime) else v)
+                    for (k, v) in self.__dict__.items()
+                }
+            )
+            bs_dict["__class__"] = self.__class__.__name__
+            object.__setattr__(self, "_BaseModel__cache", bs_dict)
+        return dict(bs_dict)
 
     def __str__(self) -> str:
-        """should print/str representation of the BaseModel instance."""
-        return f"[{self.__class__.__name__}] ({self.id}) {self.__dict__}"
+        """should print/str representation of the BaseModel instance.
+
+        The text is kept until an attribute is set or deleted, unless an
+        attribute holds a value that can change in place, like a list.
+        """
+        try:
+            text = self.__text
+        except AttributeError:
+            text = None
+        if text is None:
+            for name in ("created_at", "updated_at"):
+                getattr(self, name, None)
+            text = f"[{self.__class__.__name__}] ({self.id}) {self.__dict__}"
+            if all(type(v) in _immutable for v in self.__dict__.values()):
+                object.__setattr__(self, "_BaseModel__text", text)
+        return text
+
+
+FileStorage.register(BaseModel)
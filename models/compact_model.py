@@ -0,0 +1,246 @@
+#!/usr/bin/python3
+"""Module compact_model
+
+This Module contains a definition for CompactModel Class, a memory compact
+alternative to BaseModel, and the compact decorator that turns a model
+class into one.
+
+A compact object has no __dict__: the fields declared by its class live in
+__slots__, its id is kept as the 128-bit integer of its UUID, its
+timestamps as integer microseconds since the epoch, and the attributes its
+class doesn't declare in a dict that is only created when one is set.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import models
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+
+_epoch = datetime(1970, 1, 1)
+_microsecond = timedelta(microseconds=1)
+
+
+class CompactModel:
+    """CompactModel Class
+
+    Behaves like BaseModel for to_dict(), __str__, save() and the storage
+    engines. Subclasses are made with the compact decorator, or declare
+    their fields both in __slots__ and in __fields__.
+
+    Attributes:
+        __fields__ (dict): default value of each declared field
+        _revision (int): number of times an attribute was set or deleted,
+            as for BaseModel
+    """
+    __slots__ = ("__id", "__created", "__updated", "__extra", "__weakref__",
+                 "_revision")
+    __fields__ = {}
+
+    def __init__(self, *args, **kwargs):
+        """__init__ method & instantiation of class CompactModel
+
+        Args:
+            *args.
+            **kwargs (dict): Key/value pairs
+        """
+        self.__load(kwargs)
+        if not kwargs:
+            models.storage.new(self)
+
+    @classmethod
+    def from_dict(cls, attrs, lazy_dates=False):
+        """returns an instance of cls with the attributes of attrs, the
+        output of to_dict(), without adding it to the storage
+
+        Args:
+            attrs (dict): Key/value pairs, left unchanged
+            lazy_dates (bool): accepted for BaseModel compatibility, the
+                timestamps are always converted to integers at once
+        """
+        obj = cls.__new__(cls)
+        obj.__load(attrs)
+        return obj
+
+    def __load(self, attrs):
+        """Set the attributes of attrs, and an id and timestamps when attrs
+        doesn't have them"""
+        object.__setattr__(self, "_revision", 0)
+        self.__extra = None
+        if "id" not in attrs:
+            self.__id = uuid.uuid4().int
+        if "created_at" not in attrs or "updated_at" not in attrs:
+            self.__created = self.__updated = self.__pack_time(
+                datetime.now())
+        for k, v in attrs.items():
+            if k == "__class__":
+                continue
+            elif k in ["created_at", "updated_at"]:
+                setattr(self, k, datetime.fromisoformat(v))
+            else:
+                setattr(self, k, v)
+
+    def __init_subclass__(cls, **kwargs):
+        """Register every compact model class with the storage"""
+        super().__init_subclass__(**kwargs)
+        FileStorage.register(cls)
+
+    @property
+    def id(self):
+        """the id of the object, as a string"""
+        id = self.__id
+        return str(uuid.UUID(int=id)) if type(id) is int else id
+
+    @id.setter
+    def id(self, value):
+        """store value as an integer when it's a canonical UUID string"""
+        if type(value) is str and len(value) == 36:
+            try:
+                packed = uuid.UUID(value)
+            except ValueError:
+                pass
+            else:
+                if str(packed) == value:
+                    value = packed.int
+        self.__id = value
+
+    @property
+    def created_at(self):
+        """the creation datetime of the object"""
+        return self.__unpack_time(self.__created)
+
+    @created_at.setter
+    def created_at(self, value):
+        """store value as microseconds since the epoch when it can be"""
+        self.__created = self.__pack_time(value)
+
+    @property
+    def updated_at(self):
+        """the last update datetime of the object"""
+        return self.__unpack_time(self.__updated)
+
+    @updated_at.setter
+    def updated_at(self, value):
+        """store value as microseconds since the epoch when it can be"""
+        self.__updated = self.__pack_time(value)
+
+    def __getattr__(self, name):
+        """returns the undeclared attribute name, or the default value of
+        the declared field name when it isn't set"""
+        try:
+            extra = object.__getattribute__(self, "_CompactModel__extra")
+        except AttributeError:
+            extra = None
+        if extra and name in extra:
+            return extra[name]
+        fields = type(self).__fields__
+        if name in fields:
+            return fields[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        """Set a declared field, or else an undeclared attribute, and count
+        the change"""
+        try:
+            object.__setattr__(self, name, value)
+        except AttributeError:
+            if self.__extra is None:
+                self.__extra = {}
+            self.__extra[name] = value
+        object.__setattr__(self, "_revision", self._revision + 1)
+
+    def __delattr__(self, name):
+        """Delete a declared field, or else an undeclared attribute, and
+        count the change"""
+        try:
+            object.__delattr__(self, name)
+        except AttributeError:
+            if not self.__extra or name not in self.__extra:
+                raise
+            del self.__extra[name]
+        object.__setattr__(self, "_revision", self._revision + 1)
+
+    def save(self):
+        """Update updated_at with the current datetime."""
+        self.updated_at = datetime.now()
+        models.storage.new(self)
+        models.storage.save()
+
+    def to_dict(self):
+        """
+        returns a dictionary containing all
+        keys/values of the attributes of the instance
+        """
+        cp_dict = (
+            {
+                k: (v.isoformat() if isinstance(v, datetime) else v)
+                for (k, v) in self.__attributes().items()
+            }
+        )
+        cp_dict["__class__"] = self.__class__.__name__
+        return cp_dict
+
+    def __str__(self) -> str:
+        """should print/str representation of the CompactModel instance."""
+        return (f"[{self.__class__.__name__}] ({self.id}) "
+                f"{self.__attributes()}")
+
+    def __attributes(self):
+        """returns the attributes set on the instance, as __dict__ would
+        hold them for a BaseModel"""
+        attributes = {"id": self.id, "created_at": self.created_at,
+                      "updated_at": self.updated_at}
+        for name in type(self).__fields__:
+            try:
+                attributes[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        if self.__extra:
+            attributes.update(self.__extra)
+        return attributes
+
+    @staticmethod
+    def __pack_time(value):
+        """returns the naive datetime value as microseconds since the epoch,
+        or value itself"""
+        if type(value) is datetime and value.tzinfo is None:
+            return (value - _epoch) // _microsecond
+        return value
+
+    @staticmethod
+    def __unpack_time(value):
+        """returns the datetime of microseconds since the epoch value, or
+        value itself"""
+        return _epoch + value * _microsecond if type(value) is int else value
+
+
+def compact(model):
+    """Make a compact version of a model class and register it in place of
+    model, so that the storage builds compact objects.
+
+    The public class attributes of model and of its base classes, other than
+    methods and properties, become the declared fields, with their values
+    as defaults. The other methods and properties are copied, except
+    __init__. Can be used as a class decorator.
+
+    Args:
+        model (type): a BaseModel subclass
+    """
+    fields, namespace = {}, {}
+    for klass in reversed(model.__mro__):
+        if klass in (object, BaseModel):
+            continue
+        for k, v in vars(klass).items():
+            if k.startswith("_"):
+                continue
+            if callable(v) or isinstance(
+                    v, (property, classmethod, staticmethod)):
+                namespace[k] = v
+            else:
+                fields[k] = v
+    namespace.update(__slots__=tuple(fields), __fields__=fields,
+                     __module__=model.__module__, __doc__=model.__doc__,
+                     __qualname__=model.__qualname__)
+    return type(model.__name__, (CompactModel,), namespace)
@@ -0,0 +1,248 @@
+#!/usr/bin/python3
+"""Module binary
+
+This Module contains definitions for BinaryFormat and MappedStore Classes,
+a compact binary alternative to the JSON storage file with random access to
+single objects, and a converter between the two formats.
+
+A binary store is the MAGIC header, then one record per object (a 4-byte
+length then a marshal payload), then a footer holding the string table
+that records point into and the offset of the record of each key, then the
+8-byte offset of the footer and TRAILER.
+Class and attribute names are interned in the string table and
+created_at/updated_at are stored as integer microseconds since the epoch.
+"""
+
+import marshal
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime, timedelta
+
+from models.engine import stream
+
+MAGIC = b"HBNB\x01"
+TRAILER = b"HBNB"
+_length = struct.Struct("<I")
+_footer = struct.Struct("<Q4s")
+_epoch = datetime(1970, 1, 1)
+_microsecond = timedelta(microseconds=1)
+
+
+class BinaryFormat:
+    """BinaryFormat Class
+
+    Serializes (key, to_dict()) entries to binary records and back. The
+    string table only grows, so the records dumped by an instance stay
+    valid for every file it writes afterwards.
+
+    Attributes:
+        strings (list): the string table
+    """
+
+    def __init__(self):
+        """__init__ method & instantiation of class BinaryFormat"""
+        self.strings = []
+        self.__ids = {}
+        self.__lock = threading.Lock()
+
+    def dump_entry(self, key, value):
+        """returns the (key, binary record) pair of the "key": value
+        entry"""
+        value = dict(value)
+        name = value.pop("__class__", key.split(".")[0])
+        id = value.pop("id", None)
+        created = self.__timestamp(value, "created_at")
+        updated = self.__timestamp(value, "updated_at")
+        extras = {self.__string(k): v for k, v in value.items()}
+        payload = marshal.dumps((
+            self.__string(name),
+            None if key == f"{name}.{id}" else key,
+            id, created, updated, extras))
+        return key, _length.pack(len(payload)) + payload
+
+    def write_entries(self, f, entries):
+        """Write a binary store to binary file f from the records of its
+        entries, as returned by dump_entry
+
+        Args:
+            f (file): binary file opened for writing
+            entries (iterable): (key, binary record) pairs
+        """
+        f.write(MAGIC)
+        offset = len(MAGIC)
+        index = {}
+        for key, record in entries:
+            f.write(record)
+            index[key] = offset
+            offset += len(record)
+        with self.__lock:
+            strings = list(self.strings)
+        f.write(marshal.dumps((strings, index)))
+        f.write(_footer.pack(offset, TRAILER))
+
+    def iter_entries(self, f):
+        """Yield the (key, value) pairs of the binary store in binary file f
+        and adopt its string table.
+
+        Args:
+            f (file): seekable binary file opened for reading
+        """
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError("not a binary store")
+        f.seek(-_footer.size, os.SEEK_END)
+        end, trailer = _footer.unpack(f.read(_footer.size))
+        if trailer != TRAILER:
+            raise ValueError("truncated binary store")
+        f.seek(end)
+        self.load_footer(f.read()[:-_footer.size])
+        f.seek(len(MAGIC))
+        while f.tell() < end:
+            size, = _length.unpack(f.read(_length.size))
+            yield self.load_entry(f.read(size))
+
+    def load_footer(self, data):
+        """Adopt the string table of the marshal footer data and return its
+        index of record offsets by key"""
+        footer = marshal.loads(data)
+        strings, index = footer if isinstance(footer, tuple) \
+            else (footer, None)
+        with self.__lock:
+            self.strings = strings
+            self.__ids = {s: i for i, s in enumerate(strings)}
+        return index
+
+    def load_entry(self, payload):
+        """returns the (key, value) pair of the marshal payload of a
+        record"""
+        strings = self.strings
+        name, key, id, created, updated, extras = marshal.loads(payload)
+        name = strings[name]
+        value = {}
+        if id is not None:
+            value["id"] = id
+        if created is not None:
+            value["created_at"] = (_epoch + created * _microsecond
+                                   ).isoformat()
+        if updated is not None:
+            value["updated_at"] = (_epoch + updated * _microsecond
+                                   ).isoformat()
+        for k, v in extras.items():
+            value[strings[k]] = v
+        value["__class__"] = name
+        return key or f"{name}.{id}", value
+
+    def __string(self, s):
+        """returns the index of s in the string table, adding it if needed"""
+        i = self.__ids.get(s)
+        if i is None:
+            with self.__lock:
+                i = self.__ids.get(s)
+                if i is None:
+                    i = self.__ids[s] = len(self.strings)
+                    self.strings.append(s)
+        return i
+
+    @staticmethod
+    def __timestamp(value, name):
+        """Pop the isoformat datetime value[name] and return it as
+        microseconds since the epoch, or return None and leave it in value
+        when it can't be converted back to the same text"""
+        text = value.get(name)
+        if (not isinstance(text, str) or len(text) not in (19, 26)
+                or text[10] != "T" or text[19:20] not in ("", ".")):
+            return None
+        try:
+            dt = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+        if dt.tzinfo is not None:
+            return None
+        del value[name]
+        return (dt - _epoch) // _microsecond
+
+
+class MappedStore:
+    """MappedStore Class
+
+    Memory-maps a binary store and decodes single records on demand through
+    the offset index of its footer.
+
+    Attributes:
+        index (dict): offset of the record of each key
+    """
+
+    def __init__(self, path, fmt):
+        """__init__ method & instantiation of class MappedStore
+
+        Args:
+            path (str): path to the binary store
+            fmt (BinaryFormat): format adopting the string table of the
+                store, which decodes its records
+        """
+        self.__fmt = fmt
+        with open(path, 'rb') as f:
+            self.__map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self.__map
+        try:
+            if data[:len(MAGIC)] != MAGIC:
+                raise ValueError("not a binary store")
+            end, trailer = _footer.unpack_from(data, len(data) - _footer.size)
+            if trailer != TRAILER:
+                raise ValueError("truncated binary store")
+            self.index = fmt.load_footer(data[end:len(data) - _footer.size])
+            if self.index is None:
+                raise ValueError("binary store without offset index")
+        except BaseException:
+            self.close()
+            raise
+
+    def record(self, key, offset):
+        """returns the (key, binary record) pair stored at offset, as
+        BinaryFormat.dump_entry would"""
+        size, = _length.unpack_from(self.__map, offset)
+        return key, self.__map[offset:offset + _length.size + size]
+
+    def load(self, offset):
+        """returns the value of the record stored at offset"""
+        size, = _length.unpack_from(self.__map, offset)
+        start = offset + _length.size
+        return self.__fmt.load_entry(self.__map[start:start + size])[1]
+
+    def close(self):
+        """Unmap the store"""
+        self.__map.close()
+
+
+def is_binary(path):
+    """returns True if the file at path is a binary store"""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def convert(src, dst, binary=None):
+    """Convert the store at path src between JSON and binary formats and
+    write it at path dst.
+
+    Args:
+        src (str): path to the JSON or binary store to read
+        dst (str): path to the store to write
+        binary (bool): whether dst is written in binary, by default the
+            opposite format of src
+    """
+    fmt = BinaryFormat()
+    src_binary = is_binary(src)
+    if binary is None:
+        binary = not src_binary
+    with open(src, 'rb' if src_binary else 'r') as f:
+        entries = fmt.iter_entries(f) if src_binary \
+            else stream.iter_entries(f)
+        with open(dst, 'wb' if binary else 'w') as out:
+            if binary:
+                out_fmt = BinaryFormat()
+                out_fmt.write_entries(out, (out_fmt.dump_entry(k, v)
+                                            for k, v in entries))
+            else:
+                stream.write_entries(out, (stream.dump_entry(k, v)
+                                           for k, v in entries))
@@ -0,0 +1,241 @@
+#!/usr/bin/python3
+"""Module columns
+
+This Module contains a definition for ColumnStore Class, the column
+oriented copy of the attributes of one model class that FileStorage scans
+for filters and aggregates.
+
+Numeric attributes are kept in typed arrays, and are scanned with NumPy
+when it's installed. The other attributes are kept in lists.
+"""
+
+import math
+import operator
+from array import array
+from itertools import compress, repeat
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MISSING = object()
+_numbers = (int, float)
+
+
+def _is_number(value):
+    """returns True if value is an int or a float, but not a bool"""
+    return isinstance(value, _numbers) and not isinstance(value, bool)
+
+
+class ColumnStore:
+    """ColumnStore Class
+
+    Holds one column per attribute of the objects of a class, all in the
+    same row order.
+    A row without the attribute holds NaN in a float column and MISSING in
+    a list column; it never matches a filter and is left out of aggregates.
+    Rows are set and removed in place, a column changing to a wider type
+    when a value doesn't fit in it.
+
+    Attributes:
+        keys (list): storage key of each row
+    """
+
+    def __init__(self, keys):
+        """__init__ method & instantiation of class ColumnStore
+
+        Args:
+            keys (list): storage key of each row
+        """
+        self.keys = keys
+        self.__rows = {key: row for row, key in enumerate(keys)}
+        self.__columns = {}
+        self.__missing = {}
+
+    def __contains__(self, attr):
+        """returns True if the store has a column for attr"""
+        return attr in self.__columns
+
+    def add(self, attr, values):
+        """Add the column of attr from its value in each row, MISSING when
+        a row doesn't have it.
+
+        The column is an array of 'q' when every row holds an int, of 'd'
+        when every value is a number, and a list otherwise.
+        """
+        values = list(values)
+        present = [v for v in values if v is not MISSING]
+        missing = len(values) - len(present)
+        column = values
+        if all(map(_is_number, present)):
+            try:
+                if missing or not all(type(v) is int for v in present):
+                    raise OverflowError
+                column = array('q', values)
+            except OverflowError:
+                column = array('d', [math.nan if v is MISSING else v
+                                     for v in values])
+        self.__columns[attr] = column
+        self.__missing[attr] = missing
+
+    def put(self, key, value):
+        """Set the row of key, adding it when the store doesn't have it.
+
+        Args:
+            key (str): storage key of the row
+            value (callable): returns the value of an attribute for the
+                row, MISSING when it doesn't have it
+        """
+        row = self.__rows.get(key)
+        if row is None:
+            self.__rows[key] = len(self.keys)
+            self.keys.append(key)
+            for attr in self.__columns:
+                v = value(attr)
+                self.__fit(attr, v).append(self.__cell(attr, v))
+                self.__missing[attr] += v is MISSING
+            return
+        for attr in self.__columns:
+            v = value(attr)
+            column = self.__fit(attr, v)
+            self.__missing[attr] += (v is MISSING) - self.__is_missing(
+                column, column[row])
+            column[row] = self.__cell(attr, v)
+
+    def remove(self, key):
+        """Remove the row of key if the store has it, moving the last row
+        in its place"""
+        row = self.__rows.pop(key, None)
+        if row is None:
+            return
+        last = self.keys.pop()
+        for attr, column in self.__columns.items():
+            self.__missing[attr] -= self.__is_missing(column, column[row])
+            cell = column.pop()
+            if last != key:
+                column[row] = cell
+        if last != key:
+            self.keys[row] = last
+            self.__rows[last] = row
+
+    def column(self, attr):
+        """returns the column of attr, an array or a list"""
+        return self.__columns[attr]
+
+    def mask(self, criteria):
+        """returns the rows matching every (attr, op, operand) criterion as
+        a sequence of booleans, or None when there is no criterion"""
+        mask = None
+        for attr, op, operand in criteria:
+            rows = self.__match(attr, op, operand)
+            if mask is None:
+                mask = rows
+            elif numpy is not None:
+                mask = mask & rows
+            else:
+                mask = list(map(operator.and_, mask, rows))
+        return mask
+
+    def select(self, mask):
+        """returns the keys of the rows of mask"""
+        return list(self.keys if mask is None else compress(self.keys, mask))
+
+    def aggregate(self, attr, func, mask=None):
+        """returns the sum, mean, min, max or count of the values of attr in
+        the rows of mask, None for mean, min and max of no value"""
+        column = self.__columns[attr]
+        if numpy is not None and isinstance(column, array):
+            values = numpy.frombuffer(column, dtype=column.typecode)
+            if mask is not None:
+                values = values[numpy.asarray(mask, dtype=bool)]
+            if self.__missing[attr]:
+                values = values[~numpy.isnan(values)]
+            if func == "count":
+                return int(values.size)
+            if func == "sum":
+                return values.sum().item()
+            if values.size == 0:
+                return None
+            return getattr(values, func)().item()
+        values = column if mask is None else compress(column, mask)
+        if self.__missing[attr]:
+            values = [v for v in values if v is not MISSING and v == v]
+        elif not isinstance(values, (array, list)):
+            values = list(values)
+        if func == "count":
+            return len(values)
+        if func == "sum":
+            return sum(values)
+        if not values:
+            return None
+        if func == "mean":
+            return sum(values) / len(values)
+        return min(values) if func == "min" else max(values)
+
+    def __match(self, attr, op, operand):
+        """returns the rows whose value of attr passes `value op operand`"""
+        column = self.__columns[attr]
+        if (numpy is not None and isinstance(column, array)
+                and (_is_number(operand) or op == "in" and all(
+                    map(_is_number, operand)))):
+            values = numpy.frombuffer(column, dtype=column.typecode)
+            if op == "in":
+                return numpy.isin(values, list(operand))
+            rows = getattr(operator, op)(values, operand)
+            if op == "ne" and self.__missing[attr]:
+                rows &= ~numpy.isnan(values)
+            return rows
+        if op == "in":
+            rows = [self.__test(operator.contains, operand, v)
+                    for v in column]
+        elif op == "eq" and isinstance(column, list):
+            rows = list(map(operator.eq, column, repeat(operand)))
+        elif isinstance(column, array) and _is_number(operand):
+            rows = list(map(getattr(operator, op), column, repeat(operand)))
+            if op == "ne" and self.__missing[attr]:
+                rows = [r and v == v for r, v in zip(rows, column)]
+        else:
+            test = getattr(operator, op)
+            rows = [v is not MISSING and v == v and
+                    self.__test(test, v, operand) for v in column]
+        return rows if numpy is None else numpy.array(rows, dtype=bool)
+
+    def __fit(self, attr, value):
+        """returns the column of attr, first changed to a float array or a
+        list when value doesn't fit in it"""
+        column = self.__columns[attr]
+        if not isinstance(column, array):
+            return column
+        if column.typecode == 'q' and type(value) is int \
+                and -1 << 63 <= value < 1 << 63:
+            return column
+        if column.typecode == 'q' and (value is MISSING
+                                       or _is_number(value)):
+            column = array('d', column)
+        elif not _is_number(value) and value is not MISSING:
+            column = [MISSING if v != v else v for v in column]
+        self.__columns[attr] = column
+        return column
+
+    def __cell(self, attr, value):
+        """returns value as the column of attr holds it"""
+        if value is MISSING and isinstance(self.__columns[attr], array):
+            return math.nan
+        return value
+
+    @staticmethod
+    def __is_missing(column, cell):
+        """returns True if cell of column stands for a missing value"""
+        return cell is MISSING or isinstance(column, array) and cell != cell
+
+    @staticmethod
+    def __test(test, a, b):
+        """returns test(a, b), False when a or b is MISSING or they can't be
+        compared"""
+        if a is MISSING or b is MISSING:
+            return False
+        try:
+            return bool(test(a, b))
+        except TypeError:
+            return False
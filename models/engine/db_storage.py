@@ -0,0 +1,185 @@
+#!/usr/bin/python3
+"""Module db_storage
+
+This Module contains a definition for DBStorage Class
+"""
+
+import json
+import os
+import re
+import sqlite3
+import weakref
+
+from models.engine.file_storage import FileStorage
+
+
+class DBStorage:
+    """DBStorage Class
+
+    Stores the objects of each class in a SQLite table of its own, keyed
+    by id. Changes are written to the database inside a transaction that
+    save() commits, and reads only build the objects they return.
+
+    Attributes:
+        __db_path (str): path to the SQLite database file
+        __conn (sqlite3.Connection): connection to the database
+        __tables (set): names of the tables that already exist
+        __session (dict): objects added (or None for deleted ones) since
+            the last commit, by key
+        __unflushed (set): keys of __session not written to the database
+        __identity (WeakValueDictionary): objects built or added so far
+    """
+    __table_name = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+    def __init__(self, db_path=None):
+        """__init__ method & instantiation of class DBStorage
+
+        Args:
+            db_path (str): path to the database file, HBNB_DB_PATH or
+                "hbnb.db" by default
+        """
+        self.__db_path = db_path or os.getenv("HBNB_DB_PATH", "hbnb.db")
+        self.__conn = None
+        self.__tables = set()
+        self.__session = {}
+        self.__unflushed = set()
+        self.__identity = weakref.WeakValueDictionary()
+
+    def all(self, cls=None):
+        """returns a dictionary of all the stored objects, or of the objects
+        of class cls (a class or its name) only when cls is given"""
+        self.__flush(self.__unflushed)
+        names = sorted(self.__tables) if cls is None \
+            else [self.__class_name(cls)]
+        objects = {}
+        for name in names:
+            if name not in self.__tables:
+                continue
+            rows = self.__conn.execute(
+                f'SELECT id, created_at, updated_at, attrs FROM "{name}"')
+            for row in rows:
+                obj = self.__build(name, row)
+                objects[f"{name}.{obj.id}"] = obj
+        return objects
+
+    def count(self, cls=None):
+        """returns the number of stored objects, or of the objects of class
+        cls (a class or its name) only when cls is given"""
+        self.__flush(self.__unflushed)
+        names = self.__tables if cls is None \
+            else {self.__class_name(cls)} & self.__tables
+        return sum(self.__conn.execute(
+            f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+            for name in names)
+
+    def get(self, cls, id):
+        """returns the object of class cls (a class or its name) with id,
+        or None if there is no such object"""
+        name = self.__class_name(cls)
+        key = f"{name}.{id}"
+        if key in self.__session:
+            return self.__session[key]
+        obj = self.__identity.get(key)
+        if obj is not None or name not in self.__tables:
+            return obj
+        row = self.__conn.execute(
+            f'SELECT id, created_at, updated_at, attrs FROM "{name}" '
+            'WHERE id = ?', (id,)).fetchone()
+        return None if row is None else self.__build(name, row)
+
+    def new(self, obj):
+        """Add obj to the current transaction"""
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        self.__session[key] = obj
+        self.__unflushed.add(key)
+        self.__identity[key] = obj
+
+    def delete(self, obj=None):
+        """Delete obj from the database in the current transaction"""
+        if obj is None:
+            return
+        key = f"{obj.__class__.__name__}.{obj.id}"
+        self.__session[key] = None
+        self.__unflushed.add(key)
+        self.__identity.pop(key, None)
+
+    def save(self):
+        """Write every object of the current transaction and commit it"""
+        self.__flush(self.__session)
+        self.__conn.commit()
+        self.__session.clear()
+
+    def reload(self):
+        """Connect to the database, dropping any uncommitted change"""
+        if self.__conn is None:
+            self.__conn = sqlite3.connect(self.__db_path)
+        else:
+            self.__conn.rollback()
+        self.__tables = {row[0] for row in self.__conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.__session.clear()
+        self.__unflushed.clear()
+        self.__identity.clear()
+
+    def close(self):
+        """Close the connection to the database"""
+        if self.__conn is not None:
+            self.__conn.close()
+            self.__conn = None
+
+    @staticmethod
+    def __class_name(cls):
+        """returns the name of cls, which is a class or a class name"""
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def __build(self, name, row):
+        """returns the object stored in row of table name"""
+        key = f"{name}.{row[0]}"
+        obj = self.__identity.get(key)
+        if obj is None:
+            attrs = {"id": row[0], "created_at": row[1],
+                     "updated_at": row[2]}
+            attrs.update(json.loads(row[3]))
+            obj = FileStorage.get_class(name).from_dict(attrs,
+                                                        lazy_dates=True)
+            self.__identity[key] = obj
+        return obj
+
+    def __create_table(self, name):
+        """Create the table of class name if it doesn't exist yet"""
+        if not self.__table_name.match(name):
+            raise ValueError(f"invalid class name: {name}")
+        self.__conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{name}" (id TEXT PRIMARY KEY, '
+            'created_at TEXT, updated_at TEXT, attrs TEXT NOT NULL)')
+        self.__tables.add(name)
+
+    def __flush(self, keys):
+        """Write the session objects of keys to the database, without
+        committing, one statement per class"""
+        if self.__conn is None:
+            self.reload()
+        rows, deleted = {}, {}
+        for key in keys:
+            name, id = key.split(".", 1)
+            obj = self.__session[key]
+            if obj is None:
+                deleted.setdefault(name, []).append((id,))
+                continue
+            attrs = obj.to_dict()
+            del attrs["__class__"]
+            rows.setdefault(name, []).append(
+                (attrs.pop("id"), attrs.pop("created_at"),
+                 attrs.pop("updated_at"), json.dumps(attrs)))
+        for name, values in rows.items():
+            if name not in self.__tables:
+                self.__create_table(name)
+            self.__conn.executemany(
+                f'INSERT OR REPLACE INTO "{name}" '
+                '(id, created_at, updated_at, attrs) VALUES (?, ?, ?, ?)',
+                values)
+        for name, ids in deleted.items():
+            if name in self.__tables:
+                self.__conn.executemany(
+                    f'DELETE FROM "{name}" WHERE id = ?', ids)
+        self.__unflushed.clear()
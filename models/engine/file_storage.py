@@ -5,10 +5,76 @@ This Module contains a definition for FileStorage Class
 """
 
 
+import atexit
+import bz2
+import gzip
 import importlib
 import json
+import lzma
+import operator
 import os
 import re
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from itertools import chain, islice, repeat
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from models.engine.index import HashIndex, SortedIndex
+from models.engine.journal import Journal
+from models.engine.records import (coerce, guess_format, read_records,
+                                   write_records)
+from models.engine import stream
+from models.engine.binary import BinaryFormat, MappedStore
+from models.engine.columns import MISSING, ColumnStore
+from models.engine.rwlock import ReadWriteLock
+
+
+_codecs = {
+    "gzip": (gzip, {"compresslevel": 6}),
+    "bz2": (bz2, {}),
+    "lzma": (lzma, {"preset": 1}),
+}
+
+
+def _compressed(f, mode, compression):
+    """returns a context manager giving file f itself when compression is
+    None, or else a text stream reading or writing binary file f through
+    the compression codec, "gzip", "bz2" or "lzma"
+
+    Args:
+        f (file): file opened in mode, binary when compressed
+        mode (str): 'r' or 'w'
+        compression (str): name of the codec, or None
+    """
+    if compression is None:
+        return nullcontext(f)
+    codec, options = _codecs[compression]
+    return codec.open(f, mode + 't', **(options if mode == 'w' else {}))
+
+
+def _read_part(path, start, end, lazy, compression=None):
+    """returns the (objects, lazily loaded entries) of the entries between
+    the offsets start and end of the JSON store at path, of all of them
+    when start is None; run by the reload worker processes"""
+    if start is None:
+        with open(path, 'rb' if compression else 'r') as raw, \
+                _compressed(raw, 'r', compression) as f:
+            entries = list(stream.iter_entries(f))
+    else:
+        with open(path, 'rb') as f:
+            entries = list(stream.iter_range(f, start, end))
+    if lazy:
+        return {}, dict(entries)
+    return {k: FileStorage.get_class(k.split(".")[0]).from_dict(
+        v, lazy_dates=True) for k, v in entries}, {}
 
 
 class FileStorage:
@@ -17,34 +83,1105 @@ class FileStorage:
     Attributes:
         __file_path (str): string - path to the JSON file
         __objects (dict): A dictionary of instantiated objects.
+        __index (dict): keys of the stored objects by class name
+        __formats (dict): snapshot format of each file extension, the
+            others are JSON
+        __compressions (dict): compression of each file extension
+        __classes (dict): registered model classes by name
+        __modules (dict): module of each model class shipped with the app
 
     """
     __file_path = "file.json"
     __objects = {}
+    __index = {}
+    __classes = {}
+    __modules = {
+        "BaseModel": "models.base_model",
+        "User": "models.user",
+        "State": "models.state",
+        "City": "models.city",
+        "Amenity": "models.amenity",
+        "Place": "models.place",
+        "Review": "models.review",
+    }
+    __module_name = re.compile('(?!^)([A-Z]+)')
+    __operators = {
+        "eq": operator.eq,
+        "ne": operator.ne,
+        "lt": operator.lt,
+        "le": operator.le,
+        "gt": operator.gt,
+        "ge": operator.ge,
+        "in": lambda value, operand: value in operand,
+    }
+    __missing = object()
+    __formats = {".hbnb": "binary", ".bin": "binary"}
+    __compressions = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma"}
+    __aggregates = ("sum", "mean", "min", "max", "count")
+    __scalars = (str, int, float, bool, type(None))
+    __immutable = __scalars + (datetime,)
+
+    def __init__(self, file_path=None, journal=False, compact_every=1000,
+                 lazy=False, fsync=True, commit_delay=0.0, write_behind=False,
+                 flush_interval=1.0, flush_threshold=100, fmt=None,
+                 thread_safe=False, shared=False, shards=False,
+                 workers=None, processes=False, compression=None):
+        """__init__ method & instantiation of class FileStorage
+
+        Args:
+            file_path (str): path to the JSON file, "file.json" by default
+            journal (bool): append each change to <file_path>.log instead
+                of rewriting the whole JSON file on every save
+            compact_every (int): number of log records after which the log
+                is folded into the JSON file by a background thread
+            lazy (bool): keep reloaded entries as dicts and only build the
+                object the first time it is looked up
+            fsync (bool): flush every write to the disk before save returns
+            commit_delay (float): seconds a save waits for saves from other
+                threads to join its write; it only helps concurrent saves,
+                a thread saving in a loop waits for each of its own saves,
+                so group those with write_behind instead
+            write_behind (bool): let save return at once and write the
+                changes from a background thread, and at exit or close()
+            flush_interval (float): seconds between background writes
+            flush_threshold (int): number of saves that triggers a
+                background write before flush_interval is over
+            fmt (str): "json" or "binary" (see models.engine.binary),
+                guessed from the extension of file_path by default
+            thread_safe (bool): guard the objects with a reader/writer lock
+                so that threads can share the storage, all() then returns
+                a snapshot
+            shared (bool): let processes share file_path, each save
+                taking an exclusive lock and merging the changes saved by
+                the others since the last reload, needs fcntl
+            shards (bool): keep the objects of each class in a file of its
+                own, <file_path root>.<class name><file_path extension>,
+                and only rewrite the files of the classes that changed
+            workers (int): number of threads loading the shards, or of
+                processes with processes, by default the executor default
+            processes (bool): reload in worker processes, each parsing and
+                building the objects of a range of the lines of the JSON
+                file or of the shards
+            compression (str): "gzip", "bz2" or "lzma" to compress the
+                JSON file as it's written and read, guessed from a .gz,
+                .bz2 or .xz extension of file_path by default
+        """
+        if file_path is not None:
+            self.__file_path = file_path
+        root, ext = os.path.splitext(self.__file_path)
+        if ext.lower() in self.__compressions:
+            if compression is None:
+                compression = self.__compressions[ext.lower()]
+            ext = os.path.splitext(root)[1]
+        if fmt is None:
+            fmt = self.__formats.get(ext.lower(), "json")
+        if fmt not in ("json", "binary"):
+            raise ValueError(f"unknown storage format: {fmt}")
+        if compression is not None and compression not in _codecs:
+            raise ValueError(f"unknown compression: {compression}")
+        if compression is not None and fmt != "json":
+            raise ValueError("only JSON can be compressed")
+        if shared and fcntl is None:
+            raise ValueError("shared mode needs fcntl")
+        if (shared or shards) and journal:
+            raise ValueError("the journal can't be shared or sharded")
+        if shards and fmt != "json":
+            raise ValueError("shards are only written in JSON")
+        if processes and fmt != "json":
+            raise ValueError("processes only reload JSON")
+        self.__format = BinaryFormat() if fmt == "binary" else stream
+        self.__mode = 'b' if fmt == "binary" else ''
+        self.__compression = compression
+        self.__lazy = lazy
+        self.__raw = {}
+        self.__mapped = None
+        self.__dirty = {}
+        self.__dirty_lock = threading.Lock()
+        self.__fragments = {}
+        self.__revisions = {} if shards or journal or shared else None
+        self.__attr_indexes = {}
+        self.__columns = {}
+        self.__undo = None
+        self.__batch_thread = None
+        self.__lock = ReadWriteLock() if thread_safe else None
+        self.__build_lock = threading.Lock()
+        self.__shared = shared
+        self.__signature = None
+        self.__shards = shards
+        self.__workers = workers
+        self.__processes = processes
+        self.__fsync = fsync
+        self.__journal = Journal(f"{self.__file_path}.log", fsync) \
+            if journal else None
+        self.__compact_every = compact_every
+        self.__compact_lock = threading.Lock()
+        self.__compacting = threading.Lock()
+        self.__compactor = None
+        self.__commit_delay = commit_delay
+        self.__commit = threading.Condition()
+        self.__committing = False
+        self.__requested = 0
+        self.__committed = 0
+        self.__unflushed = 0
+        self.__flush_interval = flush_interval
+        self.__flush_threshold = flush_threshold
+        self.__wake = threading.Event()
+        self.__closed = False
+        self.__flusher = None
+        if write_behind:
+            self.__flusher = threading.Thread(target=self.__flush_loop,
+                                              daemon=True)
+            self.__flusher.start()
+            atexit.register(self.__flush_at_exit)
+
+    def all(self, cls=None):
+        """returns the dictionary __objects, or a dictionary of the objects
+        of class cls (a class or its name) only when cls is given.
+        A thread safe storage returns a copy of __objects."""
+        with self.__reading():
+            if cls is None:
+                if self.__raw:
+                    for key in list(self.__raw):
+                        self.__materialize(key)
+                if self.__lock is not None:
+                    return dict(self.__objects)
+                return self.__objects
+            objects = {}
+            for key in self.__index.get(self.__class_name(cls), ()):
+                obj = self.__objects.get(key)
+                if obj is None and key in self.__raw:
+                    obj = self.__materialize(key)
+                if obj is not None:
+                    objects[key] = obj
+            return objects
+
+    def count(self, cls=None):
+        """returns the number of stored objects, or of the objects of class
+        cls (a class or its name) only when cls is given"""
+        with self.__reading():
+            if cls is None:
+                return len(self.__objects) + len(self.__raw)
+            return len(self.__index.get(self.__class_name(cls), ()))
+
+    def get(self, cls, id):
+        """returns the object of class cls (a class or its name) with id,
+        or None if there is no such object"""
+        with self.__reading():
+            key = f"{self.__class_name(cls)}.{id}"
+            obj = self.__objects.get(key)
+            if obj is None and key in self.__raw:
+                obj = self.__materialize(key)
+            return obj
+
+    def create_index(self, cls, attr, ordered=False):
+        """Declare a secondary index on attribute attr of class cls (a class
+        or its name) to speed up query().
+
+        Args:
+            cls: the class, or class name, of the indexed objects
+            attr (str): the indexed attribute
+            ordered (bool): keep the values sorted so that the index also
+                answers lt, le, gt and ge, not only eq and in
+        """
+        with self.__writing():
+            name = self.__class_name(cls)
+            index = SortedIndex() if ordered else HashIndex()
+            self.__attr_indexes.setdefault(name, {})[attr] = index
+            self.__fill_index(index, name, attr)
+
+    def query(self, cls, **criteria):
+        """returns a dictionary of the objects of class cls (a class or its
+        name) matching every criterion.
+
+        A criterion is attr=value, or attr__<op>=value where op is one of
+        eq, ne, lt, le, gt, ge and in. Indexed attributes narrow the objects
+        looked at, the others are checked one object at a time.
+        """
+        with self.__reading():
+            name = self.__class_name(cls)
+            indexes = self.__attr_indexes.get(name, {})
+            tests = []
+            candidates = None
+            for attr, op, operand in self.__criteria(criteria):
+                tests.append((attr, self.__operators[op], operand))
+                index = indexes.get(attr)
+                keys = None if index is None else index.lookup(op, operand)
+                if keys is not None:
+                    candidates = keys if candidates is None \
+                        else candidates & keys
+            if candidates is None:
+                candidates = self.__index.get(name, set())
+            objects = {}
+            for key in list(candidates):
+                obj = self.__objects.get(key)
+                if obj is None and key in self.__raw:
+                    obj = self.__materialize(key)
+                if obj is not None and all(
+                        self.__matches(obj, *test) for test in tests):
+                    objects[key] = obj
+            return objects
+
+    def filter(self, cls, **criteria):
+        """returns the keys of the objects of class cls (a class or its
+        name) matching every criterion, scanning columns of their
+        attributes instead of the objects.
+
+        Criteria are the ones of query(). Like the attribute indexes, the
+        columns follow new() and delete().
+        """
+        with self.__reading():
+            name = self.__class_name(cls)
+            criteria = self.__criteria(criteria)
+            store = self.__column_store(name, [c[0] for c in criteria])
+            return store.select(store.mask(criteria))
+
+    def aggregate(self, cls, attr, func="sum", **criteria):
+        """returns the sum, mean, min, max or count of attribute attr over
+        the objects of class cls (a class or its name) matching every
+        criterion of query(), scanning columns of their attributes.
 
-    def all(self):
-        """returns the dictionary __objects"""
-        return self.__objects
+        Objects without attr are left out, and mean, min and max of no
+        value are None.
+        """
+        with self.__reading():
+            if func not in self.__aggregates:
+                raise ValueError(f"unknown aggregate: {func}")
+            name = self.__class_name(cls)
+            criteria = self.__criteria(criteria)
+            attrs = [attr] + [c[0] for c in criteria]
+            store = self.__column_store(name, attrs)
+            return store.aggregate(attr, func, store.mask(criteria))
 
     def new(self, obj):
         """Set in __objects obj with key <obj_class_name>.id"""
-        self.__objects[f"{obj.__class__.__name__}.{obj.id}"] = obj
+        with self.__writing():
+            name = obj.__class__.__name__
+            key = f"{name}.{obj.id}"
+            self.__remember(key)
+            self.__raw.pop(key, None)
+            self.__objects[key] = obj
+            store = self.__columns.get(name)
+            if store is not None:
+                store.put(key, lambda attr: getattr(obj, attr, MISSING))
+            self.__index.setdefault(name, set()).add(key)
+            for attr, index in self.__attr_indexes.get(name, {}).items():
+                self.__index_attr(index, key, attr)
+            with self.__dirty_lock:
+                self.__dirty[key] = obj
+
+    def delete(self, obj=None):
+        """Delete obj from __objects if it's inside"""
+        with self.__writing():
+            if obj is None:
+                return
+            key = f"{obj.__class__.__name__}.{obj.id}"
+            self.__remember(key)
+            if (self.__objects.pop(key, None) is not None
+                    or self.__raw.pop(key, None) is not None):
+                name = obj.__class__.__name__
+                store = self.__columns.get(name)
+                if store is not None:
+                    store.remove(key)
+                if self.__revisions is not None:
+                    self.__revisions.pop(key, None)
+                self.__index.get(name, set()).discard(key)
+                for index in self.__attr_indexes.get(name, {}).values():
+                    index.discard(key)
+                with self.__dirty_lock:
+                    self.__dirty[key] = None
 
     def save(self):
-        """Serialize __objects to the JSON file __file_path."""
-        with open(self.__file_path, 'w') as f:
-            json.dump({k: v.to_dict() for k, v in self.__objects.items()}, f)
+        """Serialize __objects to the JSON file __file_path.
+
+        Entries are written as they are serialized, so memory use doesn't
+        grow with the number of objects. An object is only serialized again
+        when one of its attributes was set or deleted since the last save,
+        or when it holds a value that can change in place, like a list.
+        In journal mode those objects are appended to the log instead.
+
+        In write-behind mode save returns at once and the changes are
+        written by flush() from a background thread. Inside batch() save
+        does nothing, the batch saves once when it ends. Saves from other
+        threads still write, once the batch releases the write lock of a
+        thread safe storage.
+        """
+        if (self.__undo is not None
+                and self.__batch_thread == threading.get_ident()):
+            return
+        if self.__flusher is None:
+            self.flush()
+            return
+        self.__unflushed += 1
+        if self.__unflushed >= self.__flush_threshold:
+            self.__wake.set()
+
+    def flush(self):
+        """Write the changes of every save made so far.
+
+        The file is replaced atomically, so a crash leaves either the old or
+        the new file. Saves called from other threads while a write, or a
+        journal append, is in progress are grouped into the next one, which
+        makes all of them durable at once. Only concurrent saves are grouped:
+        sequential saves of one thread are grouped by write_behind, which
+        calls flush once per flush_interval or flush_threshold saves.
+        """
+        self.__unflushed = 0
+        with self.__commit:
+            self.__requested += 1
+            ticket = self.__requested
+            while self.__committing and self.__committed < ticket:
+                self.__commit.wait()
+            if self.__committed >= ticket:
+                return
+            self.__committing = True
+        committed = self.__committed
+        try:
+            if self.__commit_delay:
+                time.sleep(self.__commit_delay)
+            with self.__commit:
+                target = self.__requested
+            if self.__journal is not None:
+                self.__append_journal()
+            else:
+                self.__write()
+            committed = target
+        finally:
+            with self.__commit:
+                self.__committing = False
+                self.__committed = committed
+                self.__commit.notify_all()
+
+    def close(self):
+        """Stop the write-behind thread and write the changes of the saves
+        it didn't write yet. Later saves write at once."""
+        if self.__flusher is None:
+            return
+        self.__closed = True
+        self.__wake.set()
+        self.__flusher.join()
+        self.__flusher = None
+        atexit.unregister(self.__flush_at_exit)
+        self.__flush_at_exit()
+
+    def __write(self):
+        """Write the changes to the file, or to the shards of the classes
+        that changed, merging the changes saved by other processes first
+        in shared mode"""
+        with self.__file_lock(True):
+            if self.__shared and self.__stat() != self.__signature:
+                with self.__writing():
+                    self.__merge()
+            dirty = self.__drop_dirty()
+            changes = self.__changes(dirty)
+            if self.__shards:
+                self.__write_shards(changes.keys() | dirty.keys())
+            else:
+                self.__write_snapshot(self.__snapshot(self.__entries()))
+            if changes:
+                self.__revisions.update(changes)
+            self.__signature = self.__stat()
+
+    def __append_journal(self):
+        """Append the objects changed since the last save, by new(),
+        delete() or their attributes, to the journal and start a compaction
+        once the journal is full"""
+        with self.__compact_lock, self.__reading():
+            dirty = self.__take_dirty()
+            changes = self.__changes(dirty)
+            for k in changes.keys() - dirty.keys():
+                dirty[k] = self.__objects[k]
+            self.__journal.append(
+                (k, None if v is None else v.to_dict())
+                for k, v in dirty.items())
+            self.__revisions.update(changes)
+            full = self.__journal.size >= self.__compact_every
+        if full and (self.__compactor is None
+                     or not self.__compactor.is_alive()):
+            self.__compactor = threading.Thread(target=self.compact,
+                                                daemon=True)
+            self.__compactor.start()
+
+    def import_file(self, path, cls=None, fmt=None, chunk_size=10000):
+        """Create or update objects from the records of an NDJSON or CSV
+        file and save them.
+
+        The records are read chunk_size at a time. The whole import is one
+        batch(), saved once at the end, except in journal mode where each
+        chunk is a batch of its own appended to the log.
+        CSV values are strings, and are only converted back to numbers for
+        the attributes that the class declares with a number default.
+
+        Args:
+            path (str): path to the file to read
+            cls: class (or class name) of the records that have no
+                __class__ field
+            fmt (str): "ndjson" or "csv", guessed from the extension of
+                path by default
+            chunk_size (int): number of records read, and saved in journal
+                mode, at a time
+
+        Returns:
+            the number of imported records
+        """
+        fmt = fmt or guess_format(path)
+        count = 0
+        with open(path, 'r', newline='') as f, \
+                self.batch() if self.__journal is None else nullcontext():
+            records = read_records(f, fmt)
+            while True:
+                chunk = list(islice(records, chunk_size))
+                if not chunk:
+                    return count
+                with self.batch():
+                    for record in chunk:
+                        count += 1
+                        self.new(self.__record_object(record, cls, fmt,
+                                                      count))
+
+    def export_file(self, path, cls=None, fmt=None):
+        """Write the stored objects, or the objects of class cls (a class or
+        its name) only when it's given, to an NDJSON or CSV file.
+
+        Args:
+            path (str): path to the file to write
+            cls: class (or class name) of the exported objects
+            fmt (str): "ndjson" or "csv", guessed from the extension of
+                path by default
+
+        Returns:
+            the number of exported records
+        """
+        with self.__reading():
+            fmt = fmt or guess_format(path)
+            fields = None
+            if fmt == "csv":
+                names = set()
+                for _, obj, entry in self.__stored(cls):
+                    names.update(entry if obj is None else obj.to_dict())
+                first = ["__class__", "id", "created_at", "updated_at"]
+                fields = first + sorted(names - set(first))
+            with open(path, 'w', newline='') as f:
+                return write_records(
+                    f, (entry if obj is None else obj.to_dict()
+                        for _, obj, entry in self.__stored(cls)), fmt, fields)
+
+    @contextmanager
+    def batch(self):
+        """Context manager deferring every save until the block ends, where
+        the storage is saved once.
+
+        If the block raises, the objects added to or deleted from the
+        storage inside it are put back as they were and nothing is saved.
+        Changes made to the attributes of an object are not undone. A batch
+        opened inside another one is part of the outer batch.
+        A thread safe storage holds its write lock until the block ends.
+        """
+        with self.__writing():
+            if self.__undo is not None:
+                yield self
+                return
+            self.__batch_thread = threading.get_ident()
+            self.__undo = {}
+            dirty = dict(self.__dirty)
+            try:
+                yield self
+            except BaseException:
+                undo, self.__undo = self.__undo, None
+                self.__batch_thread = None
+                self.__rollback(undo, dirty)
+                raise
+            self.__undo = None
+            self.__batch_thread = None
+        self.save()
+
+    def compact(self):
+        """Fold the journal into the JSON file and start a fresh log.
+
+        Compactions run one at a time, so that an older snapshot never
+        replaces a newer one, while saves keep appending to the fresh log.
+        """
+        if self.__journal is None:
+            return
+        with self.__compacting:
+            with self.__compact_lock, self.__reading():
+                self.__journal.rotate()
+                objects = list(self.__objects.items())
+                raw = list(self.__raw.items())
+            self.__write_snapshot(chain(
+                (self.__format.dump_entry(k, v.to_dict())
+                 for k, v in objects),
+                (self.__raw_fragment(k, v) for k, v in raw)))
+            self.__journal.discard_rotated()
 
     def reload(self):
-        """Deserialize the JSON file __file_path to __objects, if it exists."""
-        if (os.path.isfile(self.__file_path)
-                and os.path.getsize(self.__file_path) > 0):
-            with open(self.__file_path, 'r') as f:
-                self.__objects = {k: self.get_class(k.split(".")[0])(**v)
-                                  for k, v in json.load(f).items()}
-
-    def get_class(self, name):
+        """Deserialize the JSON file __file_path to __objects, if it exists.
+
+        The file is parsed one entry at a time so that the whole parsed
+        file and the objects built from it are never in memory together.
+        In journal mode the log is replayed on top of the JSON file.
+        In lazy mode the entries are kept as dicts until looked up, and a
+        binary store is memory-mapped so that only its index of record
+        offsets is read.
+        In shared mode the file is read under a shared lock.
+        """
+        with self.__file_lock(False), self.__writing():
+            self.__load()
+
+    def refresh(self):
+        """Reload __file_path only if it changed since it was last loaded or
+        saved, by another process for instance, and apply the changes not
+        saved yet on top of it.
+
+        Returns:
+            True if the file was reloaded
+        """
+        if self.__stat() == self.__signature:
+            return False
+        with self.__file_lock(False), self.__writing():
+            self.__merge()
+        return True
+
+    @classmethod
+    def register(cls, model):
+        """Register a model class so that it's resolved by its name"""
+        cls.__classes[model.__name__] = model
+        return model
+
+    @classmethod
+    def get_class(cls, name):
         """ returns a class from models module using its name"""
-        sub_module = re.sub('(?!^)([A-Z]+)', r'_\1', name).lower()
-        module = importlib.import_module(f"models.{sub_module}")
-        return getattr(module, name)
+        model = cls.__classes.get(name)
+        if model is None:
+            module = cls.__modules.get(name)
+            if module is None:
+                sub_module = cls.__module_name.sub(r'_\1', name).lower()
+                module = f"models.{sub_module}"
+            model = cls.register(
+                getattr(importlib.import_module(module), name))
+        return model
+
+    @staticmethod
+    def __class_name(cls):
+        """returns the name of cls, which is a class or a class name"""
+        return cls if isinstance(cls, str) else cls.__name__
+
+    def __reading(self):
+        """returns a context manager holding the read lock of a thread safe
+        storage"""
+        return nullcontext() if self.__lock is None else self.__lock.read()
+
+    def __writing(self):
+        """returns a context manager holding the write lock of a thread
+        safe storage"""
+        return nullcontext() if self.__lock is None else self.__lock.write()
+
+    @classmethod
+    def __criteria(cls, criteria):
+        """returns the (attr, op, operand) triples of query() criteria"""
+        triples = []
+        for criterion, operand in criteria.items():
+            attr, _, op = criterion.partition("__")
+            op = op or "eq"
+            if op not in cls.__operators:
+                raise ValueError(f"unknown query operator: {op}")
+            triples.append((attr, op, operand))
+        return triples
+
+    def __column_store(self, name, attrs):
+        """returns the columns of the objects of class name, adding the
+        columns of attrs it doesn't have yet"""
+        store = self.__columns.get(name)
+        if store is None:
+            store = self.__columns[name] = ColumnStore(
+                list(self.__index.get(name, ())))
+        attrs = [attr for attr in dict.fromkeys(attrs) if attr not in store]
+        if attrs:
+            rows = []
+            for key in store.keys:
+                obj = self.__objects.get(key)
+                rows.append((obj, None) if obj is not None
+                            else (None, self.__entry(self.__raw[key])))
+            for attr in attrs:
+                default = self.__default(name, attr, MISSING)
+                store.add(attr, (getattr(obj, attr, MISSING)
+                                 if entry is None
+                                 else entry.get(attr, default)
+                                 for obj, entry in rows))
+        return store
+
+    def __index_attr(self, index, key, attr):
+        """Index the value of attribute attr of the object stored at key"""
+        value = self.__value(key, attr)
+        if value is self.__missing:
+            index.discard(key)
+        else:
+            index.add(key, value)
+
+    def __fill_index(self, index, name, attr):
+        """Index the value of attribute attr of every object of class name
+        at once"""
+        values = ((key, self.__value(key, attr))
+                  for key in self.__index.get(name, ()))
+        index.update((key, value) for key, value in values
+                     if value is not self.__missing)
+
+    def __value(self, key, attr):
+        """returns the value of attribute attr of the object stored at key,
+        or __missing"""
+        obj = self.__objects.get(key)
+        if obj is not None:
+            return getattr(obj, attr, self.__missing)
+        if key in self.__raw:
+            entry = self.__entry(self.__raw[key])
+            if attr in entry:
+                return entry[attr]
+            return self.__default(key.partition(".")[0], attr, self.__missing)
+        return self.__missing
+
+    @classmethod
+    def __default(cls, name, attr, missing):
+        """returns the class level default of attribute attr of the objects
+        of class name, as getattr would find it on an object built from an
+        entry without attr, or missing"""
+        model = cls.get_class(name)
+        fields = getattr(model, "__fields__", {})
+        if attr in fields:
+            return fields[attr]
+        value = getattr(model, attr, missing)
+        return missing if hasattr(value, "__get__") else value
+
+    @classmethod
+    def __matches(cls, obj, attr, test, operand):
+        """returns True if attribute attr of obj passes test with operand"""
+        value = getattr(obj, attr, cls.__missing)
+        if value is cls.__missing:
+            return False
+        try:
+            return bool(test(value, operand))
+        except TypeError:
+            return False
+
+    def __materialize(self, key):
+        """Build the object of the lazily loaded entry key, once even when
+        readers of a thread safe storage look it up together"""
+        with self.__build_lock:
+            obj = self.__objects.get(key)
+            if obj is not None or key not in self.__raw:
+                return obj
+            return self.__build(key)
+
+    def __build(self, key):
+        """Build the object of the lazily loaded entry key"""
+        name = key.split(".")[0]
+        entry = self.__raw.pop(key)
+        obj = self.get_class(name).from_dict(self.__entry(entry),
+                                             lazy_dates=True)
+        self.__objects[key] = obj
+        for attr, index in self.__attr_indexes.get(name, {}).items():
+            self.__index_attr(index, key, attr)
+        self.__fragments.pop(key, None)
+        if self.__revisions is not None:
+            self.__revisions[key] = self.__revision(obj)
+        return obj
+
+    def __stored(self, cls=None):
+        """Yield (key, obj, None) for built objects and (key, None, entry)
+        for lazily loaded ones, of class cls only when it's given"""
+        if cls is None:
+            keys = list(chain(self.__objects, self.__raw))
+        else:
+            keys = list(self.__index.get(self.__class_name(cls), ()))
+        for key in keys:
+            obj = self.__objects.get(key)
+            if obj is not None:
+                yield key, obj, None
+            elif key in self.__raw:
+                yield key, None, self.__entry(self.__raw[key])
+
+    def __entry(self, raw):
+        """returns the dict of a lazily loaded entry, decoding it from the
+        mapped store when raw is its offset"""
+        return self.__mapped.load(raw) if isinstance(raw, int) else raw
+
+    def __raw_fragment(self, key, raw):
+        """returns the serialized form of a lazily loaded entry, copied from
+        the mapped store when raw is its offset"""
+        if isinstance(raw, int):
+            return self.__mapped.record(key, raw)
+        return self.__format.dump_entry(key, raw)
+
+    def __record_object(self, record, cls, fmt, number):
+        """returns the object built from the imported record number"""
+        name = record.pop("__class__", None) or (
+            None if cls is None else self.__class_name(cls))
+        if name is None:
+            raise ValueError(f"record {number}: missing __class__")
+        try:
+            model = self.get_class(name)
+        except (ImportError, AttributeError):
+            raise ValueError(f"record {number}: unknown class {name}")
+        if fmt == "csv":
+            record = coerce(model, record)
+        return model.from_dict(record)
+
+    def __remember(self, key):
+        """Record the entry stored at key before a batch first changes it"""
+        if self.__undo is not None and key not in self.__undo:
+            self.__undo[key] = (self.__objects.get(key), self.__raw.get(key))
+
+    def __rollback(self, undo, dirty):
+        """Put back the entries recorded in undo and the dirty objects of
+        the time the batch started, and mark the entries put back dirty in
+        case a flush wrote them during the batch"""
+        for key, (obj, entry) in undo.items():
+            name = key.split(".")[0]
+            self.__objects.pop(key, None)
+            self.__raw.pop(key, None)
+            self.__columns.pop(name, None)
+            keys = self.__index.setdefault(name, set())
+            if obj is not None:
+                self.__objects[key] = obj
+                keys.add(key)
+            elif entry is not None:
+                self.__raw[key] = entry
+                keys.add(key)
+            else:
+                keys.discard(key)
+            for attr, index in self.__attr_indexes.get(name, {}).items():
+                self.__index_attr(index, key, attr)
+            self.__fragments.pop(key, None)
+            obj = self.__objects.get(key)
+            if obj is None and key in self.__raw:
+                obj = self.__build(key)
+            dirty[key] = obj
+        with self.__dirty_lock:
+            self.__dirty = dirty
+
+    def __take_dirty(self):
+        """returns the objects changed since the last call, by key"""
+        with self.__dirty_lock:
+            dirty, self.__dirty = self.__dirty, {}
+        return dirty
+
+    def __flush_loop(self):
+        """Body of the write-behind thread, until close()"""
+        while not self.__closed:
+            self.__wake.wait(self.__flush_interval)
+            self.__wake.clear()
+            if (self.__closed or not self.__unflushed
+                    or self.__undo is not None):
+                continue
+            try:
+                self.flush()
+            except Exception:
+                self.__unflushed += 1
+                traceback.print_exc()
+
+    def __flush_at_exit(self):
+        """Write the changes left by write-behind saves at exit"""
+        if self.__unflushed:
+            self.flush()
+
+    def __drop_dirty(self):
+        """Forget the cached serialized form of the entries changed since
+        the last save, and of the entries that are gone, and return the
+        changed keys"""
+        dirty = self.__take_dirty()
+        fragments = self.__fragments
+        for k in dirty:
+            fragments.pop(k, None)
+        if len(fragments) > len(self.__objects) + len(self.__raw):
+            self.__fragments = {
+                k: v for k, v in fragments.items()
+                if k in self.__objects or k in self.__raw}
+        return dirty
+
+    def __entries(self, keys=None):
+        """Yield the serialized form of every entry, or of the entries of
+        keys only, serializing only the objects that are not cached yet.
+        Lazily loaded entries are written without being built."""
+        fragments = self.__fragments
+        if keys is None:
+            objects = list(self.__objects.items())
+            raw = list(self.__raw.items())
+        else:
+            keys = list(keys)
+            objects = [(k, self.__objects[k]) for k in keys
+                       if k in self.__objects]
+            raw = [(k, self.__raw[k]) for k in keys if k in self.__raw]
+        for k, v in objects:
+            cached = fragments.get(k)
+            if (cached is None or cached[0] is not v or cached[1] is None
+                    or cached[1] != getattr(v, "_revision", 0)):
+                revision = getattr(v, "_revision", 0)
+                attrs = v.to_dict()
+                if not all(type(a) in self.__scalars for a in attrs.values()):
+                    revision = None
+                cached = fragments[k] = (
+                    v, revision, self.__format.dump_entry(k, attrs))
+            yield cached[2]
+        for k, v in raw:
+            if isinstance(v, int):
+                yield self.__mapped.record(k, v)
+                continue
+            cached = fragments.get(k)
+            if cached is None or cached[0] is not v:
+                cached = fragments[k] = (v, v, self.__raw_fragment(k, v))
+            yield cached[2]
+
+    @classmethod
+    def __revision(cls, obj):
+        """returns the revision of obj, see BaseModel, or None when obj holds
+        a value that can change in place, like a list"""
+        attrs = getattr(obj, "__dict__", None)
+        values = (obj.to_dict() if attrs is None else attrs).values()
+        if not all(type(v) in cls.__immutable for v in values):
+            return None
+        return getattr(obj, "_revision", 0)
+
+    def __changes(self, dirty):
+        """returns the revision of the dirty objects and of the objects
+        whose attributes changed since they were loaded or written, by key,
+        when revisions are tracked"""
+        if self.__revisions is None:
+            return {}
+        revisions = self.__revisions
+        changes = {k: self.__revision(v) for k, v in dirty.items()
+                   if v is not None}
+        with self.__reading():
+            objects = list(self.__objects.items())
+        for k, v in objects:
+            if k in changes:
+                continue
+            revision = revisions.get(k, self.__missing)
+            if revision is None or revision != getattr(v, "_revision", 0):
+                changes[k] = self.__revision(v)
+        return changes
+
+    def __snapshot(self, entries):
+        """returns entries, or a list of them taken under the read lock of a
+        thread safe storage so that they are consistent"""
+        if self.__lock is None:
+            return entries
+        with self.__reading():
+            return list(entries)
+
+    def __write_shards(self, dirty):
+        """Rewrite the shards of the classes of the dirty entries, removing
+        the ones left empty"""
+        for name in {k.split(".")[0] for k in dirty}:
+            path = self.__shard_path(name)
+            keys = self.__index.get(name)
+            if keys:
+                self.__write_snapshot(self.__snapshot(self.__entries(keys)),
+                                      path)
+            elif os.path.exists(path):
+                os.remove(path)
+
+    def __split_path(self, path):
+        """returns the root and the extension of path, the extension
+        including the compression one"""
+        root, ext = os.path.splitext(path)
+        if ext.lower() in self.__compressions:
+            root, inner = os.path.splitext(root)
+            ext = inner + ext
+        return root, ext
+
+    def __shard_path(self, name):
+        """returns the path of the shard of class name"""
+        root, ext = self.__split_path(self.__file_path)
+        return f"{root}.{name}{ext}"
+
+    def __shard_paths(self):
+        """returns the path of every existing shard"""
+        directory, name = os.path.split(os.path.abspath(self.__file_path))
+        root, ext = self.__split_path(name)
+        shard = re.compile(
+            rf"{re.escape(root)}\.[A-Za-z_][A-Za-z0-9_]*{re.escape(ext)}")
+        return sorted(os.path.join(directory, f)
+                      for f in os.listdir(directory) if shard.fullmatch(f))
+
+    def __read_file(self, path):
+        """returns the (objects, lazily loaded entries) of the store at
+        path"""
+        with open(path, 'rb' if self.__compression else 'r' + self.__mode) \
+                as raw, _compressed(raw, 'r', self.__compression) as f:
+            entries = self.__format.iter_entries(f)
+            if self.__lazy:
+                return {}, dict(entries)
+            return {k: self.get_class(k.split(".")[0]).from_dict(
+                v, lazy_dates=True) for k, v in entries}, {}
+
+    def __read_parts(self, paths):
+        """returns the (objects, lazily loaded entries) of the stores at
+        paths, split into line ranges read by a pool of processes, or read
+        whole by them when a range can't be decoded"""
+        sizes = {path: os.path.getsize(path) for path in paths}
+        total = sum(sizes.values())
+        workers = self.__workers or os.cpu_count() or 1
+        parts = []
+        for path, size in sizes.items():
+            if not size:
+                continue
+            if self.__compression:
+                parts.append((path, None, None))
+                continue
+            with open(path, 'rb') as f:
+                ranges = stream.line_ranges(
+                    f, max(1, round(workers * size / total)))
+            parts.extend([(path, start, end) for start, end in ranges]
+                         if ranges is not None else [(path, None, None)])
+        if not parts:
+            return {}, {}
+        try:
+            return self.__map_parts(parts, workers)
+        except json.JSONDecodeError:
+            if all(start is None for _, start, _ in parts):
+                raise
+        return self.__map_parts(
+            list(dict.fromkeys((path, None, None) for path, _, _ in parts)),
+            workers)
+
+    def __map_parts(self, parts, workers):
+        """returns the (objects, lazily loaded entries) of the (path, start,
+        end) parts read by a pool of workers processes"""
+        objects, raw = {}, {}
+        with ProcessPoolExecutor(min(workers, len(parts))) as pool:
+            for part in pool.map(_read_part, *zip(*parts),
+                                 repeat(self.__lazy),
+                                 repeat(self.__compression)):
+                objects.update(part[0])
+                raw.update(part[1])
+        return objects, raw
+
+    def __load(self):
+        """Deserialize __file_path to __objects, see reload()"""
+        self.__signature = self.__stat()
+        if self.__mapped is not None:
+            self.__mapped.close()
+            self.__mapped = None
+        exists = (os.path.isfile(self.__file_path)
+                  and os.path.getsize(self.__file_path) > 0)
+        if self.__processes:
+            paths = self.__shard_paths() if self.__shards else \
+                [self.__file_path] if exists else []
+            self.__objects, self.__raw = self.__read_parts(paths)
+        elif self.__shards:
+            self.__objects, self.__raw = {}, {}
+            with ThreadPoolExecutor(self.__workers) as pool:
+                for objects, raw in pool.map(self.__read_file,
+                                             self.__shard_paths()):
+                    self.__objects.update(objects)
+                    self.__raw.update(raw)
+        elif exists:
+            if self.__lazy and self.__mode == 'b':
+                try:
+                    self.__mapped = MappedStore(self.__file_path,
+                                                self.__format)
+                except ValueError:
+                    pass
+                else:
+                    self.__objects, self.__raw = {}, self.__mapped.index
+            if self.__mapped is None:
+                self.__objects, self.__raw = self.__read_file(
+                    self.__file_path)
+        elif self.__journal is not None:
+            self.__objects, self.__raw = {}, {}
+        if self.__journal is not None:
+            for k, v in self.__journal.replay():
+                self.__objects.pop(k, None)
+                self.__raw.pop(k, None)
+                if v is None:
+                    continue
+                if self.__lazy:
+                    self.__raw[k] = v
+                else:
+                    self.__objects[k] = self.get_class(
+                        k.split(".")[0]).from_dict(v, lazy_dates=True)
+        self.__index = {}
+        self.__columns = {}
+        for key in chain(self.__objects, self.__raw):
+            self.__index.setdefault(key.split(".")[0], set()).add(key)
+        for name, indexes in self.__attr_indexes.items():
+            for attr in indexes:
+                index = indexes[attr] = type(indexes[attr])()
+                self.__fill_index(index, name, attr)
+        self.__take_dirty()
+        self.__unflushed = 0
+        self.__fragments.clear()
+        if self.__revisions is not None:
+            self.__revisions = {k: self.__revision(v)
+                                for k, v in self.__objects.items()}
+
+    def __merge(self):
+        """Reload __file_path and apply the changes not saved yet on top
+        of it, keeping the changed objects themselves in the storage"""
+        dirty = self.__take_dirty()
+        for k in self.__changes(dirty).keys() - dirty.keys():
+            dirty[k] = self.__objects[k]
+        self.__load()
+        for key, obj in dirty.items():
+            if obj is not None:
+                self.new(obj)
+                continue
+            obj = self.get(*key.split(".", 1))
+            if obj is not None:
+                self.delete(obj)
+
+    @contextmanager
+    def __file_lock(self, exclusive):
+        """Context manager holding an advisory lock on <file_path>.lock in
+        shared mode, exclusive or shared"""
+        if not self.__shared:
+            yield
+            return
+        with open(f"{self.__file_path}.lock", 'a') as f:
+            fcntl.flock(f.fileno(),
+                        fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def __stat(self):
+        """returns the (mtime, size, inode) signature of __file_path, None
+        when there is no such file, or the signatures of every shard"""
+        if self.__shards:
+            return tuple((path, self.__stat_file(path))
+                         for path in self.__shard_paths())
+        return self.__stat_file(self.__file_path)
+
+    @staticmethod
+    def __stat_file(path):
+        """returns the (mtime, size, inode) signature of the file at path,
+        None when there is no such file"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def __write_snapshot(self, entries, path=None):
+        """Write the serialized entries to path, __file_path by default,
+        through a temporary file renamed over it, so that a reader never
+        sees a half-written store and a crash never leaves one behind."""
+        path = path or self.__file_path
+        directory, name = os.path.split(os.path.abspath(path))
+        tmp_path = os.path.join(
+            directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path,
+                      'wb' if self.__compression else 'w' + self.__mode) as f:
+                with _compressed(f, 'w', self.__compression) as out:
+                    self.__format.write_entries(out, entries)
+                if self.__fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if self.__fsync and os.name == "posix":
+            fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
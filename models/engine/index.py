@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+"""Module index
+
+This Module contains definitions for HashIndex and SortedIndex Classes,
+the secondary indexes FileStorage keeps on model attributes
+"""
+
+import bisect
+
+
+class HashIndex:
+    """HashIndex Class
+
+    Maps each value of an attribute to the keys of the objects holding it.
+
+    Attributes:
+        ops (tuple): the query operators the index can answer
+        values (dict): the indexed value of each key
+        unindexed (set): keys whose value can't be hashed
+    """
+    ops = ("eq", "in")
+
+    def __init__(self):
+        """__init__ method & instantiation of class HashIndex"""
+        self.values = {}
+        self.unindexed = set()
+        self.__keys = {}
+
+    def add(self, key, value):
+        """Index key under value, replacing its previous value"""
+        self.discard(key)
+        try:
+            self.__keys.setdefault(value, set()).add(key)
+        except TypeError:
+            self.unindexed.add(key)
+        else:
+            self.values[key] = value
+
+    def update(self, items):
+        """Index each key of the (key, value) pairs of items"""
+        for key, value in items:
+            self.add(key, value)
+
+    def discard(self, key):
+        """Remove key from the index if it's inside"""
+        self.unindexed.discard(key)
+        if key in self.values:
+            value = self.values.pop(key)
+            keys = self.__keys[value]
+            keys.discard(key)
+            if not keys:
+                del self.__keys[value]
+
+    def lookup(self, op, operand):
+        """returns the set of keys that may match `<value> <op> operand`,
+        or None if the index can't answer op"""
+        if op not in self.ops:
+            return None
+        operands = (operand,) if op == "eq" else operand
+        keys = set(self.unindexed)
+        try:
+            for value in operands:
+                keys |= self.__keys.get(value, set())
+        except TypeError:
+            return None
+        return keys
+
+
+class SortedIndex:
+    """SortedIndex Class
+
+    Keeps the values of an attribute in sorted order for range lookups,
+    the keys of equal values in sorted order too so that a key is found by
+    bisection.
+
+    Attributes:
+        ops (tuple): the query operators the index can answer
+        unindexed (set): keys whose value can't be ordered with the others
+    """
+    ops = ("eq", "in", "lt", "le", "gt", "ge")
+
+    def __init__(self):
+        """__init__ method & instantiation of class SortedIndex"""
+        self.unindexed = set()
+        self.__values = []
+        self.__keys = []
+        self.__key_values = {}
+
+    def add(self, key, value):
+        """Index key under value, replacing its previous value"""
+        self.discard(key)
+        try:
+            i = self.__position(key, value)
+        except TypeError:
+            self.unindexed.add(key)
+            return
+        self.__values.insert(i, value)
+        self.__keys.insert(i, key)
+        self.__key_values[key] = value
+
+    def update(self, items):
+        """Index each key of the (key, value) pairs of items, sorting them
+        all at once instead of inserting them one at a time"""
+        items = dict(items)
+        for key in items:
+            self.discard(key)
+        pairs = list(zip(self.__values, self.__keys))
+        pairs.extend((value, key) for key, value in items.items())
+        try:
+            pairs.sort()
+        except TypeError:
+            for key, value in items.items():
+                self.add(key, value)
+            return
+        self.__values = [value for value, _ in pairs]
+        self.__keys = [key for _, key in pairs]
+        self.__key_values.update(items)
+
+    def discard(self, key):
+        """Remove key from the index if it's inside"""
+        self.unindexed.discard(key)
+        if key in self.__key_values:
+            i = self.__position(key, self.__key_values.pop(key))
+            del self.__values[i]
+            del self.__keys[i]
+
+    def __position(self, key, value):
+        """returns the position of (value, key) in the sorted index"""
+        values = self.__values
+        lo = bisect.bisect_left(values, value)
+        hi = bisect.bisect_right(values, value, lo)
+        return bisect.bisect_left(self.__keys, key, lo, hi)
+
+    def lookup(self, op, operand):
+        """returns the set of keys that may match `<value> <op> operand`,
+        or None if the index can't answer op"""
+        if op not in self.ops:
+            return None
+        try:
+            if op == "in":
+                keys = set()
+                for value in operand:
+                    keys |= self.lookup("eq", value)
+                return keys
+            left = bisect.bisect_left(self.__values, operand)
+            right = bisect.bisect_right(self.__values, operand)
+        except TypeError:
+            return None
+        start, stop = {
+            "eq": (left, right),
+            "lt": (0, left),
+            "le": (0, right),
+            "gt": (right, None),
+            "ge": (left, None),
+        }[op]
+        return set(self.__keys[start:stop]) | self.unindexed
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""Module journal
+
+This Module contains a definition for Journal Class
+"""
+
+import json
+import os
+
+
+class Journal:
+    """Journal Class
+
+    An append-only log of storage changes, one JSON record per line.
+    A record is {"key": <key>, "value": <to_dict() output>} for a created
+    or updated object and {"key": <key>, "value": null} for a deleted one.
+
+    Attributes:
+        path (str): path to the active log file
+        rotated_path (str): path the log is moved to while being compacted
+        size (int): number of records in the active log
+        fsync (bool): whether appended records are flushed to the disk
+    """
+
+    def __init__(self, path, fsync=False):
+        """__init__ method & instantiation of class Journal
+
+        Args:
+            path (str): path to the log file
+            fsync (bool): flush appended records to the disk before append
+                returns
+        """
+        self.path = path
+        self.fsync = fsync
+        self.rotated_path = f"{path}.1"
+        self.size = self.__count(path)
+
+    def append(self, records):
+        """Append (key, value) records to the log, one line each.
+
+        Args:
+            records (iterable): (key, dict or None) pairs
+        """
+        lines = [json.dumps({"key": k, "value": v}) + "\n"
+                 for k, v in records]
+        if not lines:
+            return
+        with open(self.path, 'a') as f:
+            f.writelines(lines)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        self.size += len(lines)
+
+    def replay(self):
+        """Yield (key, value) records of the rotated log then the active one.
+
+        A torn last line left behind by a crash is ignored.
+        """
+        for path in (self.rotated_path, self.path):
+            if not os.path.isfile(path):
+                continue
+            with open(path, 'r') as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break
+                    record = json.loads(line)
+                    yield record["key"], record["value"]
+
+    def rotate(self):
+        """Move the active log aside so that compaction can fold it into a
+        snapshot while new records go to a fresh log.
+
+        A rotated log left over from an unfinished compaction is kept and
+        the active log is appended to it.
+        """
+        if os.path.isfile(self.path):
+            if os.path.isfile(self.rotated_path):
+                with open(self.path, 'r') as src, \
+                        open(self.rotated_path, 'a') as dst:
+                    dst.write(src.read())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.rotated_path)
+        self.size = 0
+
+    def discard_rotated(self):
+        """Remove the rotated log once its changes are in a snapshot."""
+        if os.path.isfile(self.rotated_path):
+            os.remove(self.rotated_path)
+
+    def clear(self):
+        """Remove both the active and the rotated log."""
+        self.discard_rotated()
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+        self.size = 0
+
+    @staticmethod
+    def __count(path):
+        """returns the number of records in the log at path"""
+        if not os.path.isfile(path):
+            return 0
+        with open(path, 'r') as f:
+            return sum(1 for _ in f)
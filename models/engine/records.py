@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""Module records
+
+This Module contains functions to read and write model records as
+newline-delimited JSON (one to_dict() per line) or CSV, one record at a
+time, for bulk imports and exports
+"""
+
+import csv
+import json
+import os
+
+FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}
+
+
+def guess_format(path):
+    """returns the record format of path from its extension"""
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"can't guess the record format of {path}")
+    return fmt
+
+
+def read_records(f, fmt):
+    """Yield the records of text file f as dicts.
+
+    CSV cells are strings, except the ones holding a JSON list or object,
+    and empty cells are left out of the record. Numbers stay strings too,
+    see coerce().
+
+    Args:
+        f (file): text file opened with newline=''
+        fmt (str): "ndjson" or "csv"
+    """
+    if fmt == "ndjson":
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt == "csv":
+        for row in csv.DictReader(f):
+            record = {}
+            for k, v in row.items():
+                if v is None or v == "":
+                    continue
+                if v[0] in "[{":
+                    try:
+                        v = json.loads(v)
+                    except ValueError:
+                        pass
+                record[k] = v
+            yield record
+    else:
+        raise ValueError(f"unknown record format: {fmt}")
+
+
+def write_records(f, records, fmt, fields=None):
+    """Write dict records to text file f and return how many were written.
+
+    Args:
+        f (file): text file opened for writing with newline=''
+        records (iterable): the records, as returned by to_dict()
+        fmt (str): "ndjson" or "csv"
+        fields (list): CSV columns, required for "csv"
+    """
+    count = 0
+    if fmt == "ndjson":
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+            count += 1
+    elif fmt == "csv":
+        writer = csv.DictWriter(f, fields)
+        writer.writeheader()
+        for record in records:
+            writer.writerow({k: json.dumps(v) if isinstance(v, (list, dict))
+                             else v for k, v in record.items()})
+            count += 1
+    else:
+        raise ValueError(f"unknown record format: {fmt}")
+    return count
+
+
+def coerce(cls, record):
+    """Convert the string values of a CSV record to the type of the class
+    attribute of cls with the same name, or of the declared field of a
+    compact cls, when it's a number. The values of the other attributes
+    stay strings, since CSV doesn't record the type of a cell."""
+    fields = getattr(cls, "__fields__", {})
+    for k, v in record.items():
+        default = fields[k] if k in fields else getattr(cls, k, None)
+        if isinstance(v, str) and type(default) in (int, float):
+            record[k] = type(default)(v)
+    return record
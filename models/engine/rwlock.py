@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""Module rwlock
+
+This Module contains a definition for ReadWriteLock Class
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """ReadWriteLock Class
+
+    Lets any number of threads hold the read lock at once, or one thread
+    hold the write lock alone. A waiting writer keeps new readers out so
+    that a stream of readers can't starve it.
+    Both locks are reentrant, and the thread holding the write lock may
+    take the read lock too, but a reader can't take the write lock.
+    """
+
+    def __init__(self):
+        """__init__ method & instantiation of class ReadWriteLock"""
+        self.__cond = threading.Condition(threading.Lock())
+        self.__readers = {}
+        self.__writer = None
+        self.__depth = 0
+        self.__waiting = 0
+
+    @contextmanager
+    def read(self):
+        """Context manager holding the read lock"""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """Context manager holding the write lock"""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def acquire_read(self):
+        """Wait until no writer holds or waits for the lock, then take the
+        read lock"""
+        me = threading.get_ident()
+        with self.__cond:
+            if self.__writer != me and me not in self.__readers:
+                while self.__writer is not None or self.__waiting:
+                    self.__cond.wait()
+            self.__readers[me] = self.__readers.get(me, 0) + 1
+
+    def release_read(self):
+        """Release the read lock taken last by this thread"""
+        me = threading.get_ident()
+        with self.__cond:
+            depth = self.__readers[me] - 1
+            if depth:
+                self.__readers[me] = depth
+                return
+            del self.__readers[me]
+            if not self.__readers:
+                self.__cond.notify_all()
+
+    def acquire_write(self):
+        """Wait until no other thread holds the lock, then take the write
+        lock
+
+        Raises:
+            RuntimeError: when this thread only holds the read lock
+        """
+        me = threading.get_ident()
+        with self.__cond:
+            if self.__writer == me:
+                self.__depth += 1
+                return
+            if me in self.__readers:
+                raise RuntimeError("can't upgrade a read lock to write")
+            self.__waiting += 1
+            try:
+                while self.__writer is not None or self.__readers:
+                    self.__cond.wait()
+            finally:
+                self.__waiting -= 1
+            self.__writer = me
+            self.__depth = 1
+
+    def release_write(self):
+        """Release the write lock taken last by this thread"""
+        with self.__cond:
+            if self.__writer != threading.get_ident():
+                raise RuntimeError("write lock not held")
+            self.__depth -= 1
+            if not self.__depth:
+                self.__writer = None
+                self.__cond.notify_all()
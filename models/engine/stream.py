@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+"""Module stream
+
+This Module contains functions to read and write the JSON storage file
+one "key": {...} entry at a time instead of holding it whole in memory,
+and to write object listings the same way
+"""
+
+import json
+import os
+import re
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r'[ \t\n\r]*')
+
+
+class _Reader:
+    """Buffered reader over a text file that hands out JSON tokens"""
+
+    def __init__(self, f, chunk_size):
+        """__init__ method & instantiation of class _Reader"""
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Drop the consumed part of the buffer and read more of the file,
+        doubling the read size while a single value doesn't fit"""
+        size = max(self.chunk_size, len(self.buf) - self.pos)
+        chunk = self.f.read(size)
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        self.eof = not chunk
+
+    def skip_whitespace(self):
+        """Move past whitespace, reading more of the file if needed"""
+        while True:
+            self.pos = _whitespace.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or self.eof:
+                return
+            self.fill()
+
+    def char(self, expected):
+        """Consume the next non whitespace character, which must be one of
+        expected, and return it"""
+        self.skip_whitespace()
+        if self.pos >= len(self.buf) or self.buf[self.pos] not in expected:
+            raise json.JSONDecodeError(
+                f"Expecting one of {expected!r}", self.buf, self.pos)
+        self.pos += 1
+        return self.buf[self.pos - 1]
+
+    def value(self):
+        """Decode and return the next JSON value"""
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            self.fill()
+
+
+def iter_entries(f, chunk_size=1 << 16):
+    """Yield the (key, value) pairs of the JSON object in text file f,
+    parsing them one at a time.
+
+    Args:
+        f (file): text file holding a JSON object, with its entries on one
+            line or on one line each
+        chunk_size (int): number of characters read at a time
+    """
+    reader = _Reader(f, chunk_size)
+    reader.char("{")
+    reader.skip_whitespace()
+    if reader.buf[reader.pos:reader.pos + 1] == "}":
+        reader.pos += 1
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Expecting property name",
+                                       reader.buf, reader.pos)
+        reader.char(":")
+        yield key, reader.value()
+        if reader.char(",}") == "}":
+            return
+
+
+def line_ranges(f, parts):
+    """returns (start, end) byte ranges splitting binary file f into about
+    parts ranges of whole entries, for iter_range, or None when f doesn't
+    hold one entry per line as write_entries writes it, judging by its
+    first entry
+
+    Args:
+        f (file): binary file holding a JSON object
+        parts (int): number of ranges wanted
+    """
+    f.seek(0)
+    if f.readline().rstrip(b"\r\n") != b"{":
+        return None
+    start = f.tell()
+    line = f.readline().strip()
+    if line != b"}":
+        try:
+            entry = json.loads(b"{" + line.rstrip(b",") + b"}")
+        except ValueError:
+            return None
+        if len(entry) != 1:
+            return None
+    size = f.seek(0, os.SEEK_END)
+    step = max(1, -(-(size - start) // parts))
+    ranges = []
+    while start < size:
+        f.seek(min(start + step, size) - 1)
+        f.readline()
+        ranges.append((start, f.tell()))
+        start = f.tell()
+    return ranges
+
+
+def iter_range(f, start, end):
+    """Yield the (key, value) pairs of the entries between the offsets
+    start and end of binary file f, a range returned by line_ranges
+
+    Args:
+        f (file): binary file written by write_entries
+        start (int): offset of the first entry line
+        end (int): offset following the last entry line
+    """
+    f.seek(start)
+    text = f.read(end - start).decode("utf-8").strip()
+    if text.endswith("\n}") or text == "}":
+        text = text[:-1].rstrip()
+    if text:
+        yield from json.loads(f"{{{text.rstrip(',')}}}").items()
+
+
+def dump_entry(key, value):
+    """returns the JSON text of the "key": value entry"""
+    return f"{json.dumps(key)}: {json.dumps(value)}"
+
+
+def write_entries(f, entries, buffer_size=1 << 16):
+    """Write a JSON object to text file f from the JSON text of its
+    entries, one entry per line, holding at most about buffer_size
+    characters in memory.
+
+    Args:
+        f (file): text file opened for writing
+        entries (iterable): "key": value texts as returned by dump_entry
+        buffer_size (int): number of characters written at a time
+    """
+    buf, size = ["{"], 1
+    separator = "\n"
+    for entry in entries:
+        buf.append(separator)
+        buf.append(entry)
+        size += len(entry) + 2
+        separator = ",\n"
+        if size >= buffer_size:
+            f.write("".join(buf))
+            buf, size = [], 0
+    buf.append("\n}")
+    f.write("".join(buf))
+
+
+def write_listing(f, objects, buffer_size=1 << 16):
+    """Write the list of the str() of objects to text file f, followed by
+    a newline, as print([str(obj) for obj in objects]) would, holding at
+    most about buffer_size characters in memory.
+
+    Args:
+        f (file): text file opened for writing, like sys.stdout
+        objects (iterable): the objects to list
+        buffer_size (int): number of characters written at a time
+    """
+    buf, size = ["["], 1
+    separator = ""
+    for obj in objects:
+        text = repr(str(obj))
+        buf.append(separator)
+        buf.append(text)
+        size += len(text) + 2
+        separator = ", "
+        if size >= buffer_size:
+            f.write("".join(buf))
+            buf, size = [], 0
+    buf.append("]\n")
+    f.write("".join(buf))
@@ -171,6 +171,52 @@ class TestBaseModel(unittest.TestCase):
         for k, v in self.test_obj.__dict__.items():
             self.assertEqual(v, temp_obj_2.__dict__[k])
 
+    def test_str_cached_until_set(self):
+        """__str__ reuses its text until an attribute changes"""
+        self.assertIs(str(self.test_obj), str(self.test_obj))
+        self.test_obj.name = "x"
+        self.assertIn("'name': 'x'", str(self.test_obj))
+        self.test_obj.tags = ["a"]
+        str(self.test_obj)
+        self.test_obj.tags.append("b")
+        self.assertIn("['a', 'b']", str(self.test_obj))
+
+    def test_to_dict_cached_until_set(self):
+        """to_dict reuses its output until an attribute changes"""
+        first = self.test_obj.to_dict()
+        first["name"] = "changed copy"
+        self.assertNotIn("name", self.test_obj.to_dict())
+        self.test_obj.name = "x"
+        self.assertEqual(self.test_obj.to_dict()["name"], "x")
+        del self.test_obj.name
+        self.assertNotIn("name", self.test_obj.to_dict())
+        self.test_obj.save()
+        self.assertEqual(self.test_obj.to_dict()["updated_at"],
+                         self.test_obj.updated_at.isoformat())
+
+    def test_from_dict(self):
+        """from_dict builds the same object as kwargs without storing it"""
+        self.test_obj.my_number = 89
+        attrs = self.test_obj.to_dict()
+        temp_obj_2 = BaseModel.from_dict(attrs)
+        self.assertEqual(temp_obj_2.__dict__, self.test_obj.__dict__)
+        self.assertIn("__class__", attrs)
+
+    def test_from_dict_lazy_dates(self):
+        """lazy dates are parsed the first time they're read"""
+        attrs = self.test_obj.to_dict()
+        temp_obj_2 = BaseModel.from_dict(attrs, lazy_dates=True)
+        self.assertIsInstance(temp_obj_2.__dict__["created_at"], str)
+        self.assertEqual(temp_obj_2.to_dict(), attrs)
+        self.assertEqual(temp_obj_2.created_at, self.test_obj.created_at)
+        self.assertIsInstance(temp_obj_2.__dict__["created_at"], datetime)
+
+    def test_from_dict_fills_missing(self):
+        """from_dict gives an id and timestamps when attrs has none"""
+        temp_obj_2 = BaseModel.from_dict({"name": "x"})
+        self.assertEqual(str(UUID(temp_obj_2.id, version=4)), temp_obj_2.id)
+        self.assertIsInstance(temp_obj_2.updated_at, datetime)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/python3
+"""Module test_compact_model
+
+This Module contains a tests for CompactModel Class
+"""
+
+import inspect
+import os
+import unittest
+from datetime import datetime, timezone
+from uuid import UUID
+
+import pycodestyle
+from models import compact_model
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+
+CompactModel = compact_model.CompactModel
+
+
+@compact_model.compact
+class Flat(BaseModel):
+    """Flat Class, a compact test model"""
+    name = ""
+    number_rooms = 0
+
+    def describe(self):
+        """returns the name and number of rooms of the flat"""
+        return f"{self.name} ({self.number_rooms})"
+
+
+class TestCompactModelDocsAndStyle(unittest.TestCase):
+    """Tests CompactModel class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/compact_model.py",
+                "tests/test_models/test_compact_model.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(compact_model.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(CompactModel.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(CompactModel, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestCompactModel(unittest.TestCase):
+    """Test cases for CompactModel Class"""
+
+    def setUp(self):
+        """creates a test object for other tests"""
+        self.test_obj = Flat()
+        self.test_obj.name = "loft"
+
+    def test_no_instance_dict(self):
+        """compact objects keep their attributes in slots"""
+        self.assertFalse(hasattr(self.test_obj, "__dict__"))
+        self.assertIsInstance(Flat.__dict__["name"].__get__(self.test_obj),
+                              str)
+
+    def test_registered_in_place_of_model(self):
+        """the storage resolves the model name to the compact class"""
+        self.assertIs(FileStorage.get_class("Flat"), Flat)
+        self.assertTrue(issubclass(Flat, CompactModel))
+
+    def test_public_attributes(self):
+        """id is a uuid4 string and the timestamps are datetimes"""
+        self.assertEqual(str(UUID(self.test_obj.id, version=4)),
+                         self.test_obj.id)
+        self.assertIsInstance(self.test_obj.created_at, datetime)
+        self.assertIsInstance(self.test_obj.updated_at, datetime)
+
+    def test_defaults_and_methods(self):
+        """unset fields read as their class defaults and methods are
+        kept"""
+        self.assertEqual(self.test_obj.number_rooms, 0)
+        self.assertEqual(self.test_obj.describe(), "loft (0)")
+        self.assertNotIn("number_rooms", self.test_obj.to_dict())
+
+    def test_extra_attributes(self):
+        """undeclared attributes are set, read and deleted"""
+        self.test_obj.my_number = 89
+        self.assertEqual(self.test_obj.my_number, 89)
+        self.assertEqual(self.test_obj.to_dict()["my_number"], 89)
+        del self.test_obj.my_number
+        with self.assertRaises(AttributeError):
+            self.test_obj.my_number
+
+    def test_to_dict_matches_base_model(self):
+        """to_dict gives what BaseModel would for the same attributes"""
+        self.test_obj.my_number = 89
+        base = BaseModel(**self.test_obj.to_dict())
+        expected = base.to_dict()
+        expected["__class__"] = "Flat"
+        self.assertEqual(self.test_obj.to_dict(), expected)
+        self.assertEqual(str(self.test_obj).split(" ", 2)[2],
+                         str(base).split(" ", 2)[2])
+
+    def test_init_with_kwargs(self):
+        """compact objects are built back from to_dict"""
+        copy = Flat(**self.test_obj.to_dict())
+        self.assertEqual(copy.to_dict(), self.test_obj.to_dict())
+
+    def test_odd_values_kept(self):
+        """ids that aren't UUIDs and aware datetimes are kept as is"""
+        now = datetime.now(timezone.utc)
+        obj = Flat(id="flat-1", created_at=now.isoformat())
+        self.assertEqual(obj.id, "flat-1")
+        self.assertEqual(obj.created_at, now)
+
+    def test_storage_round_trip(self):
+        """FileStorage saves and reloads compact objects"""
+        file_path = "compact.json"
+        with open(file_path, 'w') as f:
+            f.write("{}")
+        storage = FileStorage(file_path)
+        storage.reload()
+        storage.new(self.test_obj)
+        storage.save()
+        storage = FileStorage(file_path)
+        storage.reload()
+        obj = storage.get(Flat, self.test_obj.id)
+        self.assertIsInstance(obj, Flat)
+        self.assertEqual(obj.to_dict(), self.test_obj.to_dict())
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    def test_csv_export(self):
+        """compact objects are exported to CSV"""
+        file_path = "compact.json"
+        with open(file_path, 'w') as f:
+            f.write("{}")
+        storage = FileStorage(file_path)
+        storage.reload()
+        storage.new(self.test_obj)
+        storage.export_file("compact.csv", Flat)
+        with open("compact.csv", 'r') as f:
+            self.assertIn(",name", f.readline())
+        for path in (file_path, "compact.csv"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+#!/usr/bin/python3
+"""Module test_binary
+
+This Module contains a tests for BinaryFormat Class
+"""
+
+import inspect
+import json
+import os
+import unittest
+from io import BytesIO
+
+import pycodestyle
+from models.engine import binary
+
+BinaryFormat = binary.BinaryFormat
+
+
+class TestBinaryDocsAndStyle(unittest.TestCase):
+    """Tests BinaryFormat class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/binary.py",
+                "tests/test_models/test_engine/test_binary.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(binary.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(BinaryFormat.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(BinaryFormat, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestBinaryFormat(unittest.TestCase):
+    """Test cases for BinaryFormat Class"""
+
+    def setUp(self):
+        """creates test entries for other tests"""
+        self.entries = {
+            "Place.1": {"id": "1", "created_at": "2024-01-02T03:04:05.678901",
+                        "updated_at": "2024-01-02T03:04:05",
+                        "name": "flat", "number_rooms": 2,
+                        "amenity_ids": ["a", "b"], "__class__": "Place"},
+            "User.2": {"id": "2", "created_at": "2024-01-02 03:04:05",
+                       "__class__": "User"},
+            "odd-key": {"id": "3", "__class__": "User"},
+        }
+
+    def write(self, fmt):
+        """returns the binary store of the test entries"""
+        f = BytesIO()
+        fmt.write_entries(f, (fmt.dump_entry(k, v)
+                              for k, v in self.entries.items()))
+        f.seek(0)
+        return f
+
+    def test_round_trip(self):
+        """entries read back exactly as they were written"""
+        f = self.write(BinaryFormat())
+        self.assertEqual(dict(BinaryFormat().iter_entries(f)), self.entries)
+
+    def test_smaller_than_json(self):
+        """the binary store, offset index included, is much smaller than
+        the JSON file"""
+        self.entries = {f"Place.{i}": dict(self.entries["Place.1"], id=i)
+                        for i in range(100)}
+        size = len(self.write(BinaryFormat()).getvalue())
+        self.assertLess(size, len(json.dumps(self.entries)) * 0.6)
+
+    def test_reading_adopts_string_table(self):
+        """records dumped after a read stay valid for the read store"""
+        fmt = BinaryFormat()
+        f = self.write(BinaryFormat())
+        list(fmt.iter_entries(f))
+        entry = fmt.dump_entry("Place.1", self.entries["Place.1"])
+        self.assertEqual(fmt.load_entry(entry[1][4:]),
+                         ("Place.1", self.entries["Place.1"]))
+
+    def test_rejects_other_files(self):
+        """JSON or truncated stores raise ValueError"""
+        with self.assertRaises(ValueError):
+            list(BinaryFormat().iter_entries(BytesIO(b'{"a": 1}')))
+        data = self.write(BinaryFormat()).getvalue()[:-3]
+        with self.assertRaises(ValueError):
+            list(BinaryFormat().iter_entries(BytesIO(data)))
+
+
+class TestMappedStore(unittest.TestCase):
+    """Test cases for MappedStore Class"""
+
+    def setUp(self):
+        """writes a binary store for other tests"""
+        self.entries = {f"User.{i}": {"id": str(i), "first_name": f"n{i}",
+                                      "__class__": "User"}
+                        for i in range(10)}
+        fmt = BinaryFormat()
+        with open("mapped.hbnb", 'wb') as f:
+            fmt.write_entries(f, (fmt.dump_entry(k, v)
+                                  for k, v in self.entries.items()))
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in ("mapped.hbnb", "mapped2.hbnb"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_load_single_records(self):
+        """records are decoded one at a time through the index"""
+        store = binary.MappedStore("mapped.hbnb", BinaryFormat())
+        self.assertEqual(set(store.index), set(self.entries))
+        self.assertEqual(store.load(store.index["User.7"]),
+                         self.entries["User.7"])
+        store.close()
+
+    def test_records_copy_to_a_new_store(self):
+        """records copied from a mapped store are valid for its format"""
+        fmt = BinaryFormat()
+        store = binary.MappedStore("mapped.hbnb", fmt)
+        with open("mapped2.hbnb", 'wb') as f:
+            fmt.write_entries(f, (store.record(k, v)
+                                  for k, v in store.index.items()))
+        store.close()
+        with open("mapped2.hbnb", 'rb') as f:
+            self.assertEqual(dict(BinaryFormat().iter_entries(f)),
+                             self.entries)
+
+    def test_rejects_other_files(self):
+        """JSON files raise ValueError"""
+        with open("mapped2.hbnb", 'w') as f:
+            f.write('{"a": 1}')
+        with self.assertRaises(ValueError):
+            binary.MappedStore("mapped2.hbnb", BinaryFormat())
+
+
+class TestConvert(unittest.TestCase):
+    """Test cases for convert"""
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in ("convert.json", "convert.hbnb", "convert2.json"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_json_to_binary_and_back(self):
+        """converting both ways gives back the same entries"""
+        entries = {"User.1": {"id": "1", "email": "a@b.c",
+                              "__class__": "User"}}
+        with open("convert.json", 'w') as f:
+            json.dump(entries, f)
+        binary.convert("convert.json", "convert.hbnb")
+        self.assertTrue(binary.is_binary("convert.hbnb"))
+        binary.convert("convert.hbnb", "convert2.json")
+        with open("convert2.json", 'r') as f:
+            self.assertEqual(json.load(f), entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+"""Module test_columns
+
+This Module contains a tests for ColumnStore Class
+"""
+
+import inspect
+import unittest
+from array import array
+
+import pycodestyle
+from models.engine import columns
+
+ColumnStore = columns.ColumnStore
+MISSING = columns.MISSING
+
+
+class TestColumnsDocsAndStyle(unittest.TestCase):
+    """Tests ColumnStore class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/columns.py",
+                "tests/test_models/test_engine/test_columns.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(columns.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(ColumnStore.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(ColumnStore, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestColumnStore(unittest.TestCase):
+    """Test cases for ColumnStore Class, with and without NumPy"""
+
+    numpy = columns.numpy
+
+    def setUp(self):
+        """creates a test store for other tests"""
+        self.store = ColumnStore(["P.1", "P.2", "P.3", "P.4"])
+        self.store.add("rooms", [1, 3, 2, 5])
+        self.store.add("price", [10.5, MISSING, 30, 40])
+        self.store.add("city", ["a", "b", "a", MISSING])
+
+    def tearDown(self):
+        """restores NumPy when a test ran without it"""
+        columns.numpy = self.numpy
+
+    def each(self, check):
+        """runs check with and without NumPy, when it's installed"""
+        for numpy in {None, self.numpy}:
+            columns.numpy = numpy
+            with self.subTest(numpy=numpy is not None):
+                check()
+
+    def test_column_types(self):
+        """ints, numbers with gaps and other values get their own type"""
+        self.assertEqual(self.store.column("rooms").typecode, 'q')
+        self.assertEqual(self.store.column("price").typecode, 'd')
+        self.assertIsInstance(self.store.column("city"), list)
+        self.assertNotIsInstance(self.store.column("city"), array)
+
+    def test_filter(self):
+        """rows matching every criterion are selected"""
+        def select(*criteria):
+            """returns the keys of the rows matching criteria"""
+            return self.store.select(self.store.mask(criteria))
+
+        def check():
+            self.assertEqual(select(("rooms", "gt", 1), ("city", "eq", "a")),
+                             ["P.3"])
+            self.assertEqual(select(("price", "ne", 30)), ["P.1", "P.4"])
+            self.assertEqual(select(("rooms", "in", [1, 5])), ["P.1", "P.4"])
+            self.assertEqual(select(("city", "ne", "a")), ["P.2"])
+            self.assertEqual(select(("rooms", "lt", "x")), [])
+            self.assertEqual(select(), ["P.1", "P.2", "P.3", "P.4"])
+        self.each(check)
+
+    def test_aggregate(self):
+        """aggregates leave out missing values"""
+        def check():
+            aggregate = self.store.aggregate
+            self.assertEqual(aggregate("rooms", "sum"), 11)
+            self.assertEqual(aggregate("price", "count"), 3)
+            self.assertAlmostEqual(aggregate("price", "mean"), 80.5 / 3)
+            self.assertEqual(aggregate("price", "max"), 40)
+            mask = self.store.mask([("city", "eq", "a")])
+            self.assertEqual(aggregate("rooms", "min", mask), 1)
+            self.assertEqual(aggregate("city", "min"), "a")
+            mask = self.store.mask([("city", "eq", "z")])
+            self.assertIsNone(aggregate("price", "mean", mask))
+            self.assertEqual(aggregate("price", "sum", mask), 0)
+        self.each(check)
+
+    def row(self, **attrs):
+        """returns the value function of put() for a row holding attrs"""
+        return lambda attr: attrs.get(attr, MISSING)
+
+    def test_put_and_remove(self):
+        """rows are set, added and removed in place, widening columns"""
+        self.store.put("P.2", self.row(rooms=4, price=20))
+        self.store.put("P.5", self.row(rooms=2.5, city="c"))
+        self.store.remove("P.1")
+        self.store.remove("P.9")
+        self.assertEqual(sorted(self.store.keys),
+                         ["P.2", "P.3", "P.4", "P.5"])
+        self.assertEqual(self.store.column("rooms").typecode, 'd')
+
+        def check():
+            aggregate = self.store.aggregate
+            self.assertEqual(aggregate("rooms", "sum"), 13.5)
+            self.assertEqual(aggregate("price", "count"), 3)
+            self.assertEqual(aggregate("price", "min"), 20)
+            self.assertEqual(aggregate("city", "count"), 2)
+            mask = self.store.mask([("price", "ne", 30)])
+            self.assertEqual(sorted(self.store.select(mask)), ["P.2", "P.4"])
+        self.each(check)
+        self.store.put("P.3", self.row(rooms="many"))
+        self.assertIsInstance(self.store.column("rooms"), list)
+        self.assertEqual(self.store.aggregate("price", "count"), 2)
+        self.assertEqual(self.store.select(
+            self.store.mask([("rooms", "eq", "many")])), ["P.3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""Module test_db_storage
+
+This Module contains a tests for DBStorage Class
+"""
+
+import inspect
+import os
+import unittest
+
+import pycodestyle
+from models.engine import db_storage
+from tests.test_models.test_base_model import BaseModel
+
+DBStorage = db_storage.DBStorage
+
+
+class TestDBStorageDocsAndStyle(unittest.TestCase):
+    """Tests DBStorage class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/db_storage.py",
+                "tests/test_models/test_engine/test_db_storage.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(db_storage.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(DBStorage.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(DBStorage, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestDBStorage(unittest.TestCase):
+    """Test cases for DBStorage Class"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.db_path = "test_hbnb.db"
+        self.storage = DBStorage(self.db_path)
+        self.storage.reload()
+
+    def tearDown(self):
+        """cleanup test files"""
+        self.storage.close()
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+
+    def test_save_and_reload_objects(self):
+        """saved objects are read back by a new storage"""
+        objs = [BaseModel() for _ in range(3)]
+        for obj in objs:
+            obj.name = "db"
+            self.storage.new(obj)
+        self.storage.save()
+
+        storage = DBStorage(self.db_path)
+        storage.reload()
+        saved = {k: v.to_dict() for k, v in storage.all().items()}
+        storage.close()
+        self.assertEqual(saved, {f"BaseModel.{o.id}": o.to_dict()
+                                 for o in objs})
+
+    def test_all_count_and_get_see_uncommitted_objects(self):
+        """reads include objects added since the last save"""
+        obj = BaseModel()
+        self.storage.new(obj)
+        self.assertIn(f"BaseModel.{obj.id}", self.storage.all(BaseModel))
+        self.assertEqual(self.storage.count("BaseModel"), 1)
+        self.assertEqual(self.storage.count(), 1)
+        self.assertIs(self.storage.get(BaseModel, obj.id), obj)
+        self.assertEqual(self.storage.all("Missing"), {})
+
+    def test_reload_drops_uncommitted_changes(self):
+        """reload rolls back the changes that were not saved"""
+        kept, dropped = BaseModel(), BaseModel()
+        self.storage.new(kept)
+        self.storage.save()
+        self.storage.new(dropped)
+        self.storage.delete(kept)
+        self.storage.reload()
+        self.assertIsNotNone(self.storage.get(BaseModel, kept.id))
+        self.assertIsNone(self.storage.get(BaseModel, dropped.id))
+
+    def test_delete(self):
+        """deleted objects are removed from the database"""
+        obj = BaseModel()
+        self.storage.new(obj)
+        self.storage.save()
+        self.storage.delete(obj)
+        self.storage.save()
+        self.assertIsNone(self.storage.get(BaseModel, obj.id))
+        self.assertEqual(self.storage.count(BaseModel), 0)
@@ -4,13 +4,20 @@
 This Module contains a tests for FileStorage Class
 """
 
+import bz2
+import gzip
 import inspect
 import json
+import lzma
+import multiprocessing
 import os
+import threading
+import time
 import unittest
 
 import pycodestyle
 from models.engine import file_storage
+from models.engine.binary import BinaryFormat
 from tests.test_models.test_base_model import BaseModel
 
 FileStorage = file_storage.FileStorage
@@ -128,3 +135,1229 @@ class TestFileStorage(unittest.TestCase):
         existing_objects_dict = {k: v.to_dict()
                                  for k, v in existing_objects.items()}
         self.assertEqual(expected_objects, existing_objects_dict)
+
+
+class TestFileStorageJournal(unittest.TestCase):
+    """Test cases for FileStorage in journal mode"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "journal_file.json"
+        self.storage = FileStorage(self.file_path, journal=True)
+        self.storage.reload()
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in (self.file_path, f"{self.file_path}.log",
+                     f"{self.file_path}.log.1"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_save_appends_only_changed_objects(self):
+        """save appends one log record per new object"""
+        for _ in range(3):
+            self.storage.new(BaseModel())
+        self.storage.save()
+        self.storage.new(BaseModel())
+        self.storage.save()
+        with open(f"{self.file_path}.log", 'r') as f:
+            self.assertEqual(len(f.readlines()), 4)
+        self.assertFalse(os.path.exists(self.file_path))
+
+    def test_reload_replays_the_log(self):
+        """reload restores created and deleted objects from the log"""
+        kept, removed = BaseModel(), BaseModel()
+        self.storage.new(kept)
+        self.storage.new(removed)
+        self.storage.save()
+        self.storage.delete(removed)
+        self.storage.save()
+
+        storage = FileStorage(self.file_path, journal=True)
+        storage.reload()
+        self.assertIn(f"BaseModel.{kept.id}", storage.all())
+        self.assertNotIn(f"BaseModel.{removed.id}", storage.all())
+
+    def test_attribute_changes_appended(self):
+        """an attribute set without new() is appended on the next save,
+        and unchanged objects are not"""
+        obj, other = BaseModel(), BaseModel()
+        self.storage.new(obj)
+        self.storage.new(other)
+        self.storage.save()
+        obj.name = "x"
+        self.storage.save()
+        self.storage.save()
+        with open(f"{self.file_path}.log", 'r') as f:
+            self.assertEqual(len(f.readlines()), 3)
+        storage = FileStorage(self.file_path, journal=True)
+        storage.reload()
+        self.assertEqual(storage.get(BaseModel, obj.id).name, "x")
+
+    def test_compact_folds_log_into_snapshot(self):
+        """compact writes the JSON file and empties the log"""
+        obj = BaseModel()
+        self.storage.new(obj)
+        self.storage.save()
+        self.storage.compact()
+
+        self.assertFalse(os.path.exists(f"{self.file_path}.log"))
+        with open(self.file_path, 'r') as f:
+            self.assertIn(f"BaseModel.{obj.id}", json.load(f))
+
+    def test_concurrent_saves_share_an_append(self):
+        """saves from several threads are appended to the log together"""
+        storage = FileStorage(self.file_path, journal=True, commit_delay=0.05)
+        storage.reload()
+        journal = storage._FileStorage__journal
+        append, appends = journal.append, []
+
+        def counted(records):
+            """counts the appends to the log"""
+            appends.append(1)
+            append(records)
+
+        journal.append = counted
+        objs = [BaseModel() for _ in range(5)]
+
+        def save(obj):
+            """adds obj and saves the storage"""
+            storage.new(obj)
+            storage.save()
+
+        threads = [threading.Thread(target=save, args=(o,)) for o in objs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLess(len(appends), len(objs))
+        storage = FileStorage(self.file_path, journal=True)
+        storage.reload()
+        for obj in objs:
+            self.assertIsNotNone(storage.get(BaseModel, obj.id))
+
+    def test_compactions_run_one_at_a_time(self):
+        """a compaction waits for the one in progress to be written"""
+        first, second = BaseModel(), BaseModel()
+        self.storage.new(first)
+        self.storage.save()
+        write = self.storage._FileStorage__write_snapshot
+        started, release = threading.Event(), threading.Event()
+
+        def slow_write(entries, path=None):
+            """blocks the first compaction before it writes"""
+            entries = list(entries)
+            if not started.is_set():
+                started.set()
+                release.wait(5)
+            write(entries, path)
+
+        self.storage._FileStorage__write_snapshot = slow_write
+        older = threading.Thread(target=self.storage.compact)
+        older.start()
+        started.wait(5)
+        self.storage.new(second)
+        self.storage.save()
+        newer = threading.Thread(target=self.storage.compact)
+        newer.start()
+        time.sleep(0.05)
+        release.set()
+        older.join(5)
+        newer.join(5)
+
+        storage = FileStorage(self.file_path, journal=True)
+        storage.reload()
+        self.assertEqual(storage.count(), 2)
+
+
+class TestFileStorageIncrementalSave(unittest.TestCase):
+    """Test cases for FileStorage dirty tracking"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "file.json"
+        with open(self.file_path, 'w') as f:
+            json.dump({}, f)
+        self.storage = FileStorage()
+        self.storage.reload()
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_save_reuses_unchanged_objects(self):
+        """objects whose attributes weren't set keep their saved form"""
+        obj = BaseModel()
+        self.storage.new(obj)
+        self.storage.save()
+        obj.__dict__["name"] = "not seen"
+        self.storage.save()
+        with open(self.file_path, 'r') as f:
+            self.assertNotIn("name", json.load(f)[f"BaseModel.{obj.id}"])
+
+    def test_save_sees_changed_attributes(self):
+        """attributes set or changed in place are saved without new()"""
+        obj = BaseModel()
+        obj.tags = []
+        self.storage.new(obj)
+        self.storage.save()
+        obj.name = "changed"
+        obj.tags.append("x")
+        self.storage.save()
+        with open(self.file_path, 'r') as f:
+            saved = json.load(f)[f"BaseModel.{obj.id}"]
+        self.assertEqual(saved["name"], "changed")
+        self.assertEqual(saved["tags"], ["x"])
+        obj.tags.append("y")
+        del obj.name
+        self.storage.save()
+        with open(self.file_path, 'r') as f:
+            saved = json.load(f)[f"BaseModel.{obj.id}"]
+        self.assertNotIn("name", saved)
+        self.assertEqual(saved["tags"], ["x", "y"])
+
+    def test_delete_removes_object_from_file(self):
+        """deleted objects are dropped from the file on the next save"""
+        obj = BaseModel()
+        self.storage.new(obj)
+        self.storage.save()
+        self.storage.delete(obj)
+        self.storage.save()
+        with open(self.file_path, 'r') as f:
+            self.assertNotIn(f"BaseModel.{obj.id}", json.load(f))
+
+
+class TestFileStorageLazy(unittest.TestCase):
+    """Test cases for FileStorage in lazy mode"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "file.json"
+        self.objs = [BaseModel() for _ in range(3)]
+        with open(self.file_path, 'w') as f:
+            json.dump({f"BaseModel.{o.id}": o.to_dict()
+                       for o in self.objs}, f)
+        self.storage = FileStorage(lazy=True)
+        self.storage.reload()
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_get_builds_only_the_requested_object(self):
+        """get returns the object without building the others"""
+        obj = self.storage.get(BaseModel, self.objs[0].id)
+        self.assertIsInstance(obj, BaseModel)
+        self.assertEqual(obj.to_dict(), self.objs[0].to_dict())
+        self.assertIs(self.storage.get("BaseModel", obj.id), obj)
+        self.assertIsNone(self.storage.get(BaseModel, "missing"))
+
+    def test_all_builds_every_object(self):
+        """all returns objects for every entry of the file"""
+        objects = self.storage.all()
+        self.assertEqual(len(objects), 3)
+        for obj in self.objs:
+            self.assertIsInstance(objects[f"BaseModel.{obj.id}"], BaseModel)
+
+    def test_save_keeps_entries_that_were_not_built(self):
+        """save writes entries that were never looked up"""
+        self.storage.delete(self.storage.get(BaseModel, self.objs[0].id))
+        self.storage.save()
+        with open(self.file_path, 'r') as f:
+            saved = json.load(f)
+        self.assertNotIn(f"BaseModel.{self.objs[0].id}", saved)
+        self.assertEqual(saved[f"BaseModel.{self.objs[1].id}"],
+                         self.objs[1].to_dict())
+
+
+class TestFileStorageClassRegistry(unittest.TestCase):
+    """Test cases for the FileStorage class registry"""
+
+    def test_get_class_returns_registered_class(self):
+        """BaseModel and its subclasses are registered by name"""
+        class Registered(BaseModel):
+            """subclass defined outside of the models package"""
+
+        self.assertIs(FileStorage.get_class("BaseModel"), BaseModel)
+        self.assertIs(FileStorage.get_class("Registered"), Registered)
+
+    def test_register_returns_the_class(self):
+        """register can be used as a class decorator"""
+        class Plain:
+            """class that does not inherit from BaseModel"""
+
+        self.assertIs(FileStorage.register(Plain), Plain)
+        self.assertIs(FileStorage().get_class("Plain"), Plain)
+
+
+class TestFileStorageClassIndex(unittest.TestCase):
+    """Test cases for the FileStorage per-class index"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "file.json"
+        with open(self.file_path, 'w') as f:
+            json.dump({}, f)
+        self.storage = FileStorage()
+        self.storage.reload()
+
+        class Indexed(BaseModel):
+            """model class used to check the per-class index"""
+
+        self.cls = Indexed
+        self.objs = [Indexed() for _ in range(3)]
+        for obj in self.objs:
+            self.storage.new(obj)
+        self.storage.new(BaseModel())
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_all_with_class_returns_only_that_class(self):
+        """all(cls) returns the objects of cls only"""
+        expected = {f"Indexed.{o.id}": o for o in self.objs}
+        self.assertEqual(self.storage.all(self.cls), expected)
+        self.assertEqual(self.storage.all("Indexed"), expected)
+
+    def test_count(self):
+        """count returns the number of objects overall or of a class"""
+        self.assertEqual(self.storage.count(self.cls), 3)
+        self.assertEqual(self.storage.count("Missing"), 0)
+        self.assertEqual(self.storage.count(), len(self.storage.all()))
+
+    def test_index_follows_delete_and_reload(self):
+        """the index is updated by delete and rebuilt by reload"""
+        self.storage.delete(self.objs[0])
+        self.assertEqual(self.storage.count(self.cls), 2)
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual(set(self.storage.all(self.cls)),
+                         {f"Indexed.{o.id}" for o in self.objs[1:]})
+
+
+class TestFileStorageThreadSafe(unittest.TestCase):
+    """Test cases for FileStorage shared by threads"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "file_threads.json"
+        with open(self.file_path, 'w') as f:
+            json.dump({}, f)
+        self.storage = FileStorage(self.file_path, thread_safe=True,
+                                   fsync=False)
+        self.storage.reload()
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_concurrent_writers_and_readers(self):
+        """objects added from several threads are all saved while other
+        threads read"""
+        errors = []
+
+        def write():
+            try:
+                for _ in range(50):
+                    self.storage.new(BaseModel())
+                    self.storage.save()
+            except Exception as e:
+                errors.append(e)
+
+        def read():
+            try:
+                for _ in range(200):
+                    for obj in self.storage.all().values():
+                        obj.to_dict()
+                    self.storage.count(BaseModel)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=f)
+                   for f in (write, write, write, read, read)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.storage.count(), 150)
+        storage = FileStorage(self.file_path)
+        storage.reload()
+        self.assertEqual(storage.count(), 150)
+
+    def test_all_is_a_snapshot(self):
+        """all() returns a copy that later changes don't touch"""
+        objects = self.storage.all()
+        self.storage.new(BaseModel())
+        self.assertEqual(len(objects), 0)
+
+    def test_batches_of_threads_dont_mix(self):
+        """a batch opened by another thread waits for the current one"""
+        obj = BaseModel()
+        done = []
+
+        def other():
+            with self.storage.batch():
+                done.append(self.storage.count())
+
+        with self.storage.batch():
+            self.storage.new(obj)
+            thread = threading.Thread(target=other)
+            thread.start()
+            thread.join(0.1)
+            self.assertEqual(done, [])
+        thread.join(1)
+        self.assertEqual(done, [1])
+
+    def test_save_of_another_thread_during_a_batch(self):
+        """a save from another thread waits for the batch and writes, even
+        when the batch is rolled back"""
+        obj = BaseModel()
+        self.storage.new(obj)
+        with self.assertRaises(KeyError):
+            with self.storage.batch():
+                thread = threading.Thread(target=self.storage.save)
+                thread.start()
+                thread.join(0.1)
+                self.assertTrue(thread.is_alive())
+                raise KeyError(obj.id)
+        thread.join(1)
+        with open(self.file_path) as f:
+            self.assertIn(f"BaseModel.{obj.id}", json.load(f))
+
+
+class TestFileStorageShared(unittest.TestCase):
+    """Test cases for FileStorage shared by processes"""
+
+    def setUp(self):
+        """initial configuration for tests, two storages on the same file
+        stand for two processes"""
+        self.file_path = "file_shared.json"
+        with open(self.file_path, 'w') as f:
+            json.dump({}, f)
+        self.first = FileStorage(self.file_path, shared=True, fsync=False)
+        self.second = FileStorage(self.file_path, shared=True, fsync=False)
+        self.first.reload()
+        self.second.reload()
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in (self.file_path, f"{self.file_path}.lock"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_saves_merge(self):
+        """a save keeps the objects the other process saved meanwhile"""
+        kept, added = BaseModel(), BaseModel()
+        self.first.new(kept)
+        self.first.save()
+        self.second.new(added)
+        self.second.save()
+        storage = FileStorage(self.file_path)
+        storage.reload()
+        self.assertIsNotNone(storage.get(BaseModel, kept.id))
+        self.assertIsNotNone(storage.get(BaseModel, added.id))
+
+    def test_attribute_changes_merge(self):
+        """an attribute set without new() survives the merge, and the
+        changed object stays the stored one"""
+        obj = BaseModel()
+        self.first.new(obj)
+        self.first.save()
+        self.second.new(BaseModel())
+        self.second.save()
+        obj.name = "changed"
+        self.first.save()
+        self.assertIs(self.first.get(BaseModel, obj.id), obj)
+        storage = FileStorage(self.file_path)
+        storage.reload()
+        self.assertEqual(storage.get(BaseModel, obj.id).name, "changed")
+        self.assertEqual(storage.count(), 2)
+        obj.name = "again"
+        self.first.save()
+        storage.reload()
+        self.assertEqual(storage.get(BaseModel, obj.id).name, "again")
+
+    def test_deletes_merge(self):
+        """a delete saved after the other process's save is kept"""
+        obj = BaseModel()
+        self.first.new(obj)
+        self.first.save()
+        self.second.refresh()
+        self.first.new(BaseModel())
+        self.first.save()
+        self.second.delete(self.second.get(BaseModel, obj.id))
+        self.second.save()
+        self.first.refresh()
+        self.assertIsNone(self.first.get(BaseModel, obj.id))
+        self.assertEqual(self.first.count(), 1)
+
+    def test_refresh_only_on_change(self):
+        """refresh reloads only a changed file and keeps unsaved changes"""
+        self.assertFalse(self.second.refresh())
+        self.first.new(BaseModel())
+        self.first.save()
+        self.assertFalse(self.first.refresh())
+        unsaved = BaseModel()
+        self.second.new(unsaved)
+        self.assertTrue(self.second.refresh())
+        self.assertEqual(self.second.count(), 2)
+        self.assertIs(self.second.get(BaseModel, unsaved.id), unsaved)
+        self.assertFalse(self.second.refresh())
+
+    def test_processes(self):
+        """objects saved one at a time by several processes are all kept"""
+        def work():
+            storage = FileStorage(self.file_path, shared=True, fsync=False)
+            storage.reload()
+            for _ in range(20):
+                storage.new(BaseModel())
+                storage.save()
+
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=work) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertTrue(self.first.refresh())
+        self.assertEqual(self.first.count(), 80)
+
+    def test_journal_rejected(self):
+        """the journal can't be shared"""
+        with self.assertRaises(ValueError):
+            FileStorage(self.file_path, shared=True, journal=True)
+
+
+class ShardUser(BaseModel):
+    """ShardUser Class, a second model class for the shard tests"""
+
+
+class TestFileStorageShards(unittest.TestCase):
+    """Test cases for FileStorage with a shard per class"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "file_shards.json"
+        self.storage = FileStorage(self.file_path, shards=True, fsync=False)
+        self.storage.reload()
+        self.base, self.user = BaseModel(), ShardUser()
+        self.storage.new(self.base)
+        self.storage.new(self.user)
+        self.storage.save()
+
+    def tearDown(self):
+        """cleanup test files"""
+        for name in ("BaseModel", "ShardUser"):
+            path = f"file_shards.{name}.json"
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_one_file_per_class(self):
+        """each class is saved in its own file and reloaded from all"""
+        self.assertFalse(os.path.exists(self.file_path))
+        with open("file_shards.ShardUser.json", 'r') as f:
+            self.assertEqual(list(json.load(f)),
+                             [f"ShardUser.{self.user.id}"])
+        for workers in (1, 2):
+            storage = FileStorage(self.file_path, shards=True,
+                                  workers=workers)
+            storage.reload()
+            self.assertEqual(storage.count(), 2)
+            self.assertEqual(storage.get(ShardUser, self.user.id).to_dict(),
+                             self.user.to_dict())
+
+    def test_only_dirty_shards_written(self):
+        """a save rewrites only the files of the classes that changed"""
+        inode = os.stat("file_shards.BaseModel.json").st_ino
+        self.user.name = "x"
+        self.storage.new(self.user)
+        self.storage.save()
+        self.assertEqual(os.stat("file_shards.BaseModel.json").st_ino,
+                         inode)
+        self.storage.delete(self.base)
+        self.storage.save()
+        self.assertFalse(os.path.exists("file_shards.BaseModel.json"))
+
+    def test_attribute_changes_saved(self):
+        """a shard is rewritten when an attribute of one of its objects is
+        set without new(), and only then"""
+        inode = os.stat("file_shards.BaseModel.json").st_ino
+        self.user.name = "x"
+        self.storage.save()
+        self.assertEqual(os.stat("file_shards.BaseModel.json").st_ino,
+                         inode)
+        storage = FileStorage(self.file_path, shards=True)
+        storage.reload()
+        self.assertEqual(storage.get(ShardUser, self.user.id).name, "x")
+        del self.user.name
+        self.storage.save()
+        storage.reload()
+        self.assertFalse(hasattr(storage.get(ShardUser, self.user.id),
+                                 "name"))
+
+    def test_options_checked(self):
+        """the journal and binary stores can't be sharded"""
+        with self.assertRaises(ValueError):
+            FileStorage(self.file_path, shards=True, journal=True)
+        with self.assertRaises(ValueError):
+            FileStorage("file_shards.hbnb", shards=True)
+
+
+class TestFileStorageProcesses(unittest.TestCase):
+    """Test cases for FileStorage reloaded by worker processes"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "file_processes.json"
+        self.addCleanup(self.remove_files)
+        self.storage = FileStorage(self.file_path, fsync=False)
+        with open(self.file_path, 'w') as f:
+            f.write("{}")
+        self.storage.reload()
+        self.objects = [BaseModel() for i in range(20)]
+        for i, obj in enumerate(self.objects):
+            obj.number = i
+            self.storage.new(obj)
+        self.storage.save()
+
+    def remove_files(self):
+        """cleanup test files, even when setUp fails"""
+        for path in (self.file_path, f"{self.file_path}.log",
+                     "file_processes.BaseModel.json"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def check(self, **kwargs):
+        """reloads the test objects in processes and compares them"""
+        storage = FileStorage(self.file_path, processes=True, **kwargs)
+        storage.reload()
+        self.assertEqual(storage.count(), len(self.objects))
+        for obj in self.objects:
+            self.assertEqual(storage.get(BaseModel, obj.id).to_dict(),
+                             obj.to_dict())
+
+    def test_reload(self):
+        """the objects are split between the workers and merged back"""
+        for workers in (1, 3):
+            self.check(workers=workers)
+        self.check(workers=2, lazy=True)
+
+    def test_reload_one_line_file(self):
+        """a file with its entries on one line is read by one worker"""
+        with open(self.file_path, 'w') as f:
+            json.dump({f"BaseModel.{obj.id}": obj.to_dict()
+                       for obj in self.objects}, f)
+        self.check(workers=2)
+
+    def test_reload_pretty_printed_file(self):
+        """an indented file is read whole, whatever its first line"""
+        with open(self.file_path, 'w') as f:
+            json.dump({f"BaseModel.{obj.id}": obj.to_dict()
+                       for obj in self.objects}, f, indent=4)
+        self.check(workers=2)
+
+    def test_reload_shards(self):
+        """the shards are split between the workers too"""
+        storage = FileStorage(self.file_path, shards=True, fsync=False)
+        for obj in self.objects:
+            storage.new(obj)
+        storage.save()
+        os.remove(self.file_path)
+        self.check(workers=2, shards=True)
+
+    def test_reload_journal(self):
+        """the log is replayed on top of the file read by the workers"""
+        os.remove(self.file_path)
+        storage = FileStorage(self.file_path, journal=True, fsync=False)
+        storage.reload()
+        for obj in self.objects:
+            storage.new(obj)
+        storage.save()
+        storage.compact()
+        self.check(workers=2, journal=True)
+        extra = BaseModel()
+        storage.new(extra)
+        storage.save()
+        self.objects.append(extra)
+        self.check(workers=2, journal=True)
+
+    def test_reload_missing_file(self):
+        """a missing file reloads nothing"""
+        os.remove(self.file_path)
+        storage = FileStorage(self.file_path, processes=True)
+        storage.reload()
+        self.assertEqual(storage.count(), 0)
+
+    def test_binary_refused(self):
+        """the binary store can't be reloaded in processes"""
+        with self.assertRaises(ValueError):
+            FileStorage("file_processes.hbnb", processes=True)
+
+
+class TestFileStorageCompression(unittest.TestCase):
+    """Test cases for FileStorage with a compressed JSON file"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.objects = [BaseModel() for i in range(5)]
+        self.paths = []
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in self.paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def save(self, file_path, codec=gzip, **kwargs):
+        """saves the test objects to file_path, which starts out empty and
+        compressed with codec, and returns the storage"""
+        self.paths.append(file_path)
+        with codec.open(file_path, 'wt') as f:
+            json.dump({}, f)
+        storage = FileStorage(file_path, fsync=False, **kwargs)
+        storage.reload()
+        for obj in self.objects:
+            storage.new(obj)
+        storage.save()
+        return storage
+
+    def check(self, file_path, **kwargs):
+        """reloads file_path and compares the objects"""
+        storage = FileStorage(file_path, **kwargs)
+        storage.reload()
+        self.assertEqual(storage.count(), len(self.objects))
+        for obj in self.objects:
+            self.assertEqual(storage.get(BaseModel, obj.id).to_dict(),
+                             obj.to_dict())
+
+    def test_codec_from_extension(self):
+        """the extension picks the codec, and the file reloads"""
+        for path, codec, magic in (
+                ("file_c.json.gz", gzip, b"\x1f\x8b"),
+                ("file_c.json.bz2", bz2, b"BZh"),
+                ("file_c.json.xz", lzma, b"\xfd7zXZ")):
+            self.save(path, codec)
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(len(magic)), magic)
+            self.check(path)
+            self.check(path, lazy=True)
+            self.check(path, processes=True, workers=2)
+
+    def test_codec_option(self):
+        """the compression option applies to any file name"""
+        self.save("file_c.json", compression="gzip")
+        with gzip.open("file_c.json", 'rt') as f:
+            self.assertEqual(len(json.load(f)), len(self.objects))
+        self.check("file_c.json", compression="gzip")
+
+    def test_shards(self):
+        """the shards keep the compression extension"""
+        self.save("file_c.json.gz", shards=True)
+        self.paths.append("file_c.BaseModel.json.gz")
+        self.assertTrue(os.path.exists("file_c.BaseModel.json.gz"))
+        self.check("file_c.json.gz", shards=True)
+
+    def test_options_checked(self):
+        """unknown codecs and compressed binary stores are refused"""
+        with self.assertRaises(ValueError):
+            FileStorage("file_c.json", compression="zip")
+        with self.assertRaises(ValueError):
+            FileStorage("file_c.hbnb.gz")
+
+
+class PricedPlace(BaseModel):
+    """PricedPlace Class, a model class with a class level default"""
+    price_by_night = 0
+
+
+class TestFileStorageColumns(unittest.TestCase):
+    """Test cases for FileStorage column scans"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "file.json"
+        with open(self.file_path, 'w') as f:
+            json.dump({}, f)
+        self.storage = FileStorage()
+        self.storage.reload()
+        self.objs = []
+        for i in range(6):
+            obj = BaseModel()
+            obj.city_id = "a" if i % 2 else "b"
+            obj.price = i * 10
+            self.storage.new(obj)
+            self.objs.append(obj)
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_filter(self):
+        """filter returns the keys matching every criterion"""
+        self.assertEqual(
+            set(self.storage.filter(BaseModel, city_id="a", price__ge=30)),
+            {f"BaseModel.{o.id}" for o in (self.objs[3], self.objs[5])})
+        with self.assertRaises(ValueError):
+            self.storage.filter(BaseModel, price__like=1)
+
+    def test_aggregate(self):
+        """aggregates scan the matching objects"""
+        self.assertEqual(self.storage.aggregate(BaseModel, "price"), 150)
+        self.assertEqual(self.storage.aggregate(
+            "BaseModel", "price", "mean", city_id="a"), 30)
+        self.assertEqual(self.storage.aggregate(
+            BaseModel, "price", "count", city_id="z"), 0)
+        with self.assertRaises(ValueError):
+            self.storage.aggregate(BaseModel, "price", "median")
+
+    def test_columns_follow_changes(self):
+        """new() and delete() are seen by the next scan"""
+        self.assertEqual(self.storage.aggregate(BaseModel, "price", "max"),
+                         50)
+        self.objs[0].price = 100
+        self.storage.new(self.objs[0])
+        self.assertEqual(self.storage.aggregate(BaseModel, "price", "max"),
+                         100)
+        self.storage.delete(self.objs[0])
+        self.assertEqual(self.storage.aggregate(BaseModel, "price", "max"),
+                         50)
+
+    def test_lazy_entries_not_built(self):
+        """lazily loaded entries are scanned without building objects"""
+        self.storage.save()
+        storage = FileStorage(lazy=True)
+        storage.reload()
+        self.assertEqual(storage.aggregate(BaseModel, "price", city_id="b"),
+                         60)
+        self.assertEqual(len(storage.filter(BaseModel, price__lt=20)), 2)
+
+    def test_lazy_entries_use_class_defaults(self):
+        """lazily loaded entries are scanned with class level defaults"""
+        places = [PricedPlace() for _ in range(3)]
+        places[0].price_by_night = 20
+        for place in places:
+            self.storage.new(place)
+        self.storage.save()
+        storage = FileStorage(lazy=True)
+        storage.reload()
+        for scanned in (storage, self.storage):
+            self.assertEqual(
+                set(scanned.filter(PricedPlace, price_by_night=0)),
+                {f"PricedPlace.{p.id}" for p in places[1:]})
+            self.assertEqual(scanned.aggregate(
+                PricedPlace, "price_by_night", "count"), 3)
+
+
+class TestFileStorageQuery(unittest.TestCase):
+    """Test cases for FileStorage attribute indexes and query"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "file.json"
+        with open(self.file_path, 'w') as f:
+            json.dump({}, f)
+        self.storage = FileStorage()
+        self.storage.reload()
+        self.storage.create_index(BaseModel, "city_id")
+        self.storage.create_index(BaseModel, "price", ordered=True)
+        self.objs = []
+        for i in range(6):
+            obj = BaseModel()
+            obj.city_id = "a" if i % 2 else "b"
+            obj.price = i * 10
+            self.storage.new(obj)
+            self.objs.append(obj)
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def keys(self, *objs):
+        """returns the storage keys of objs"""
+        return {f"BaseModel.{o.id}" for o in objs}
+
+    def test_query_with_indexes(self):
+        """query combines equality and range criteria"""
+        self.assertEqual(set(self.storage.query(BaseModel, city_id="a")),
+                         self.keys(*self.objs[1::2]))
+        self.assertEqual(
+            set(self.storage.query(BaseModel, city_id="a", price__lt=40)),
+            self.keys(self.objs[1], self.objs[3]))
+
+    def test_query_without_index(self):
+        """attributes without index are checked one object at a time"""
+        self.assertEqual(
+            set(self.storage.query("BaseModel", id__in=[self.objs[0].id])),
+            self.keys(self.objs[0]))
+        with self.assertRaises(ValueError):
+            self.storage.query(BaseModel, price__between=(1, 2))
+
+    def test_indexes_follow_updates_and_deletes(self):
+        """new after an update and delete keep the indexes in sync"""
+        self.objs[0].city_id = "a"
+        self.storage.new(self.objs[0])
+        self.storage.delete(self.objs[1])
+        self.assertEqual(
+            set(self.storage.query(BaseModel, city_id="a")),
+            self.keys(self.objs[0], self.objs[3], self.objs[5]))
+
+    def test_lazy_entries_use_class_defaults(self):
+        """an entry without the attribute has the class level default"""
+        places = [PricedPlace() for _ in range(3)]
+        places[0].price_by_night = 20
+        for place in places:
+            self.storage.new(place)
+        self.storage.save()
+        storage = FileStorage(lazy=True)
+        storage.reload()
+        storage.create_index(PricedPlace, "price_by_night", ordered=True)
+        self.assertEqual(
+            set(storage.query(PricedPlace, price_by_night__lt=10)),
+            {f"PricedPlace.{p.id}" for p in places[1:]})
+
+
+class TestFileStorageAtomicSave(unittest.TestCase):
+    """Test cases for FileStorage crash-safe saves"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "file.json"
+        with open(self.file_path, 'w') as f:
+            json.dump({}, f)
+        self.storage = FileStorage(commit_delay=0.05)
+        self.storage.reload()
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_save_leaves_no_temporary_file(self):
+        """the temporary file is renamed over the JSON file"""
+        self.storage.new(BaseModel())
+        self.storage.save()
+        self.assertEqual([f for f in os.listdir(".") if f.endswith(".tmp")],
+                         [])
+
+    def test_failed_save_keeps_previous_file(self):
+        """an error while writing leaves the previous file untouched"""
+        class Broken(BaseModel):
+            """model that can't be serialized"""
+
+            def to_dict(self):
+                """raises like a failing write would"""
+                raise OSError("disk full")
+
+        self.storage.new(Broken())
+        with self.assertRaises(OSError):
+            self.storage.save()
+        with open(self.file_path, 'r') as f:
+            self.assertEqual(json.load(f), {})
+
+    def test_concurrent_saves_are_grouped(self):
+        """saves from several threads all reach the file"""
+        objs = [BaseModel() for _ in range(5)]
+
+        def save(obj):
+            """adds obj and saves the storage"""
+            self.storage.new(obj)
+            self.storage.save()
+
+        threads = [threading.Thread(target=save, args=(o,)) for o in objs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with open(self.file_path, 'r') as f:
+            saved = json.load(f)
+        for obj in objs:
+            self.assertIn(f"BaseModel.{obj.id}", saved)
+
+
+class TestFileStorageWriteBehind(unittest.TestCase):
+    """Test cases for FileStorage in write-behind mode"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "file.json"
+        with open(self.file_path, 'w') as f:
+            json.dump({}, f)
+        self.storage = FileStorage(write_behind=True, flush_interval=60,
+                                   flush_threshold=3)
+        self.storage.reload()
+
+    def tearDown(self):
+        """stop the background thread and cleanup test files"""
+        self.storage.close()
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def saved(self):
+        """returns the entries of the JSON file"""
+        with open(self.file_path, 'r') as f:
+            return json.load(f)
+
+    def test_save_does_not_write(self):
+        """save returns without writing and flush writes"""
+        obj = BaseModel()
+        self.storage.new(obj)
+        self.storage.save()
+        self.assertEqual(self.saved(), {})
+        self.storage.flush()
+        self.assertIn(f"BaseModel.{obj.id}", self.saved())
+
+    def test_threshold_wakes_the_flusher(self):
+        """enough saves get written by the background thread"""
+        objs = [BaseModel() for _ in range(3)]
+        for obj in objs:
+            self.storage.new(obj)
+            self.storage.save()
+        for _ in range(100):
+            if len(self.saved()) == 3:
+                break
+            time.sleep(0.01)
+        self.assertEqual(len(self.saved()), 3)
+
+    def test_close(self):
+        """close writes the pending saves and stops the background
+        thread"""
+        threads = threading.active_count()
+        obj = BaseModel()
+        self.storage.new(obj)
+        self.storage.save()
+        self.storage.close()
+        self.assertIn(f"BaseModel.{obj.id}", self.saved())
+        self.assertEqual(threading.active_count(), threads - 1)
+        other = BaseModel()
+        self.storage.new(other)
+        self.storage.save()
+        self.assertIn(f"BaseModel.{other.id}", self.saved())
+        self.storage.close()
+
+
+class TestFileStorageBatch(unittest.TestCase):
+    """Test cases for FileStorage.batch"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "file.json"
+        with open(self.file_path, 'w') as f:
+            json.dump({}, f)
+        self.storage = FileStorage()
+        self.storage.reload()
+        self.kept = BaseModel()
+        self.storage.new(self.kept)
+        self.storage.save()
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def saved(self):
+        """returns the entries of the JSON file"""
+        with open(self.file_path, 'r') as f:
+            return json.load(f)
+
+    def remove(self, *paths):
+        """removes the files of paths that exist"""
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_batch_saves_once_at_the_end(self):
+        """saves inside the block are deferred to its end"""
+        with self.storage.batch():
+            objs = [BaseModel() for _ in range(3)]
+            for obj in objs:
+                self.storage.new(obj)
+                self.storage.save()
+                self.assertEqual(len(self.saved()), 1)
+        self.assertEqual(len(self.saved()), 4)
+
+    def test_batch_rolls_back_on_error(self):
+        """an exception puts added and deleted objects back"""
+        added = BaseModel()
+        with self.assertRaises(KeyError):
+            with self.storage.batch():
+                self.storage.new(added)
+                self.storage.delete(self.kept)
+                raise KeyError("abort")
+        self.assertIn(f"BaseModel.{self.kept.id}", self.storage.all())
+        self.assertNotIn(f"BaseModel.{added.id}", self.storage.all())
+        self.assertEqual(self.storage.count(BaseModel), 1)
+        self.storage.save()
+        self.assertEqual(list(self.saved()), [f"BaseModel.{self.kept.id}"])
+
+    def test_rollback_after_flush(self):
+        """entries written by a flush inside the block are rewritten"""
+        file_path = "file_batch.json"
+        self.addCleanup(self.remove, "file_batch.BaseModel.json",
+                        "file_batch.ShardUser.json")
+        storage = FileStorage(file_path, shards=True, fsync=False)
+        storage.reload()
+        storage.new(ShardUser())
+        storage.save()
+        with self.assertRaises(KeyError):
+            with storage.batch():
+                storage.new(BaseModel())
+                storage.flush()
+                raise KeyError("abort")
+        storage.save()
+        storage = FileStorage(file_path, shards=True)
+        storage.reload()
+        self.assertEqual(storage.count(), 1)
+
+
+class TestFileStorageImportExport(unittest.TestCase):
+    """Test cases for FileStorage bulk import and export"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "file.json"
+        with open(self.file_path, 'w') as f:
+            json.dump({}, f)
+        self.storage = FileStorage()
+        self.storage.reload()
+        self.objs = []
+        for i in range(5):
+            obj = BaseModel()
+            obj.number = i
+            obj.tags = ["t"]
+            self.storage.new(obj)
+            self.objs.append(obj)
+
+    def tearDown(self):
+        """cleanup test files"""
+        for path in (self.file_path, "import.json", "export.ndjson",
+                     "export.csv"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def check_round_trip(self, path):
+        """exports the objects to path and imports them in a new storage"""
+        self.assertEqual(self.storage.export_file(path, BaseModel), 5)
+        with open("import.json", 'w') as f:
+            json.dump({}, f)
+        storage = FileStorage("import.json")
+        storage.reload()
+        self.assertEqual(storage.import_file(path, chunk_size=2), 5)
+        for obj in self.objs:
+            imported = storage.get(BaseModel, obj.id)
+            self.assertEqual(imported.tags, ["t"])
+            self.assertEqual(imported.created_at, obj.created_at)
+        return storage
+
+    def test_ndjson_round_trip(self):
+        """objects exported to NDJSON are imported unchanged"""
+        storage = self.check_round_trip("export.ndjson")
+        self.assertEqual(storage.get(BaseModel, self.objs[3].id).number, 3)
+        with open("import.json", 'r') as f:
+            self.assertEqual(len(json.load(f)), 5)
+
+    def test_csv_round_trip(self):
+        """objects exported to CSV are imported with their values"""
+        storage = self.check_round_trip("export.csv")
+        self.assertEqual(storage.get(BaseModel, self.objs[3].id).number,
+                         "3")
+
+    def test_import_requires_a_class(self):
+        """records without __class__ need the cls argument"""
+        with open("export.ndjson", 'w') as f:
+            f.write('{"id": "1"}\n')
+        with self.assertRaises(ValueError):
+            self.storage.import_file("export.ndjson")
+        self.assertEqual(self.storage.import_file("export.ndjson",
+                                                  "BaseModel"), 1)
+        self.assertIsNotNone(self.storage.get(BaseModel, "1"))
+
+    def test_import_saves_once(self):
+        """the chunks are saved together, and not at all on an error"""
+        self.storage.save()
+        with open("export.ndjson", 'w') as f:
+            for i in range(4):
+                f.write(json.dumps({"__class__": "BaseModel",
+                                    "id": f"new-{i}"}) + "\n")
+            f.write('{"id": "no class"}\n')
+        with self.assertRaises(ValueError):
+            self.storage.import_file("export.ndjson", chunk_size=2)
+        self.assertEqual(self.storage.count(), 5)
+        with open(self.file_path, 'r') as f:
+            self.assertEqual(len(json.load(f)), 5)
+
+
+class TestFileStorageBinary(unittest.TestCase):
+    """Test cases for FileStorage with a binary store"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.file_path = "file.hbnb"
+        with open(self.file_path, 'wb') as f:
+            BinaryFormat().write_entries(f, [])
+        self.storage = FileStorage(self.file_path)
+        self.storage.reload()
+
+    def tearDown(self):
+        """cleanup test files"""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def test_save_and_reload(self):
+        """objects saved in binary are reloaded unchanged"""
+        objs = [BaseModel() for _ in range(3)]
+        for obj in objs:
+            obj.rooms = 4
+            self.storage.new(obj)
+        self.storage.save()
+        self.storage.delete(objs[0])
+        self.storage.save()
+
+        for lazy in (False, True):
+            storage = FileStorage(self.file_path, lazy=lazy)
+            storage.reload()
+            self.assertEqual(storage.count(), 2)
+            for obj in objs[1:]:
+                self.assertEqual(storage.get(BaseModel, obj.id).to_dict(),
+                                 obj.to_dict())
+
+    def test_lazy_mapped(self):
+        """a lazy binary store only decodes the objects looked up and keeps
+        the others when saved"""
+        objs = [BaseModel() for _ in range(3)]
+        for obj in objs:
+            self.storage.new(obj)
+        self.storage.save()
+        storage = FileStorage(self.file_path, lazy=True)
+        storage.reload()
+        self.assertEqual(storage.get(BaseModel, objs[1].id).id, objs[1].id)
+        self.assertEqual(len(storage.all()), 3)
+        storage = FileStorage(self.file_path, lazy=True)
+        storage.reload()
+        storage.get(BaseModel, objs[0].id).rooms = 5
+        storage.save()
+        storage.reload()
+        self.assertEqual(storage.get(BaseModel, objs[0].id).rooms, 5)
+        self.assertEqual(storage.count(), 3)
+        self.assertEqual(storage.get(BaseModel, objs[2].id).to_dict(),
+                         objs[2].to_dict())
+
+    def test_format_option(self):
+        """fmt overrides the extension and is validated"""
+        with self.assertRaises(ValueError):
+            FileStorage(fmt="xml")
+        os.rename(self.file_path, "file.json")
+        self.file_path = "file.json"
+        self.storage = FileStorage("file.json", fmt="binary")
+        self.storage.reload()
+        self.storage.new(BaseModel())
+        self.storage.save()
+        with open(self.file_path, 'rb') as f:
+            self.assertTrue(f.read().startswith(b"HBNB"))
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""Module test_index
+
+This Module contains a tests for HashIndex and SortedIndex Classes
+"""
+
+import inspect
+import unittest
+
+import pycodestyle
+from models.engine import index
+
+HashIndex = index.HashIndex
+SortedIndex = index.SortedIndex
+
+
+class TestIndexDocsAndStyle(unittest.TestCase):
+    """Tests index classes for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/index.py",
+                "tests/test_models/test_engine/test_index.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(index.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the classes are documented"""
+        self.assertTrue(len(HashIndex.__doc__) >= 1)
+        self.assertTrue(len(SortedIndex.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        for cls in (HashIndex, SortedIndex):
+            funcs = inspect.getmembers(cls, inspect.isfunction)
+            for func in funcs:
+                self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestHashIndex(unittest.TestCase):
+    """Test cases for HashIndex Class"""
+
+    def setUp(self):
+        """creates a test index for other tests"""
+        self.index = HashIndex()
+        self.index.add("A.1", "x")
+        self.index.add("A.2", "y")
+        self.index.add("A.3", ["unhashable"])
+
+    def test_lookup_eq_and_in(self):
+        """eq and in return matching and unindexed keys"""
+        self.assertEqual(self.index.lookup("eq", "x"), {"A.1", "A.3"})
+        self.assertEqual(self.index.lookup("in", ["x", "y"]),
+                         {"A.1", "A.2", "A.3"})
+
+    def test_add_replaces_previous_value(self):
+        """adding a key again moves it to its new value"""
+        self.index.add("A.1", "y")
+        self.assertEqual(self.index.lookup("eq", "x"), {"A.3"})
+        self.index.discard("A.1")
+        self.assertEqual(self.index.lookup("eq", "y"), {"A.2", "A.3"})
+
+    def test_unsupported_operator(self):
+        """ranges can't be answered by a hash index"""
+        self.assertIsNone(self.index.lookup("lt", "x"))
+
+
+class TestSortedIndex(unittest.TestCase):
+    """Test cases for SortedIndex Class"""
+
+    def setUp(self):
+        """creates a test index for other tests"""
+        self.index = SortedIndex()
+        for i, price in enumerate([30, 10, 20, 10]):
+            self.index.add(f"A.{i}", price)
+
+    def test_lookup_ranges(self):
+        """range operators return the keys inside the range"""
+        self.assertEqual(self.index.lookup("lt", 20), {"A.1", "A.3"})
+        self.assertEqual(self.index.lookup("le", 20), {"A.1", "A.2", "A.3"})
+        self.assertEqual(self.index.lookup("gt", 20), {"A.0"})
+        self.assertEqual(self.index.lookup("ge", 20), {"A.0", "A.2"})
+        self.assertEqual(self.index.lookup("eq", 10), {"A.1", "A.3"})
+        self.assertEqual(self.index.lookup("in", [10, 30]),
+                         {"A.0", "A.1", "A.3"})
+
+    def test_discard_and_unorderable_values(self):
+        """discarded keys are gone and unorderable values stay candidates"""
+        self.index.discard("A.1")
+        self.index.add("A.4", "cheap")
+        self.assertEqual(self.index.lookup("eq", 10), {"A.3", "A.4"})
+        self.assertIsNone(self.index.lookup("lt", "cheap"))
+
+    def test_update_matches_add(self):
+        """a bulk update indexes like adding each key in turn"""
+        items = [(f"B.{i}", (i * 7) % 5) for i in range(40)]
+        items.append(("A.0", 1))
+        added, updated = SortedIndex(), SortedIndex()
+        for index in (added, updated):
+            index.add("A.0", 30)
+            index.add("A.1", 10)
+        for key, value in items:
+            added.add(key, value)
+        updated.update(items)
+        for op in ("lt", "eq", "ge"):
+            for operand in range(-1, 12):
+                self.assertEqual(updated.lookup(op, operand),
+                                 added.lookup(op, operand))
+        for key, _ in items:
+            updated.discard(key)
+        self.assertEqual(updated.lookup("ge", 0), {"A.1"})
+        updated.update([("A.5", "text"), ("A.6", 3)])
+        self.assertEqual(updated.unindexed, {"A.5"})
+        self.assertEqual(updated.lookup("lt", 5), {"A.5", "A.6"})
+
+
+if __name__ == "__main__":
+    unittest.main()
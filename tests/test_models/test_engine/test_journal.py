@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""Module test_journal
+
+This Module contains a tests for Journal Class
+"""
+
+import inspect
+import os
+import unittest
+
+import pycodestyle
+from models.engine import journal
+
+Journal = journal.Journal
+
+
+class TestJournalDocsAndStyle(unittest.TestCase):
+    """Tests Journal class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/journal.py",
+                "tests/test_models/test_engine/test_journal.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(journal.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(Journal.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(Journal, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestJournal(unittest.TestCase):
+    """Test cases for Journal Class"""
+
+    def setUp(self):
+        """initial configuration for tests"""
+        self.path = "test_journal.log"
+        self.journal = Journal(self.path)
+
+    def tearDown(self):
+        """cleanup test files"""
+        self.journal.clear()
+
+    def test_append_and_replay(self):
+        """replay yields appended records in order"""
+        self.journal.append([("A.1", {"id": "1"}), ("A.2", {"id": "2"})])
+        self.journal.append([("A.1", None)])
+        self.assertEqual(self.journal.size, 3)
+        self.assertEqual(list(self.journal.replay()),
+                         [("A.1", {"id": "1"}), ("A.2", {"id": "2"}),
+                          ("A.1", None)])
+
+    def test_size_is_restored_from_existing_log(self):
+        """a new Journal counts the records already in the log"""
+        self.journal.append([("A.1", {"id": "1"})])
+        self.assertEqual(Journal(self.path).size, 1)
+
+    def test_replay_ignores_torn_last_line(self):
+        """a half-written last record is skipped"""
+        self.journal.append([("A.1", {"id": "1"})])
+        with open(self.path, 'a') as f:
+            f.write('{"key": "A.2", "val')
+        self.assertEqual(list(self.journal.replay()),
+                         [("A.1", {"id": "1"})])
+
+    def test_rotate_keeps_records_for_replay(self):
+        """rotated records are replayed before the active log"""
+        self.journal.append([("A.1", {"id": "1"})])
+        self.journal.rotate()
+        self.journal.append([("A.1", None)])
+        self.assertEqual(self.journal.size, 1)
+        self.assertEqual(list(self.journal.replay()),
+                         [("A.1", {"id": "1"}), ("A.1", None)])
+        self.journal.discard_rotated()
+        self.assertFalse(os.path.exists(self.journal.rotated_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""Module test_records
+
+This Module contains a tests for the records module
+"""
+
+import inspect
+import unittest
+from io import StringIO
+
+import pycodestyle
+from models.engine import records
+
+
+class TestRecordsDocsAndStyle(unittest.TestCase):
+    """Tests records module for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/records.py",
+                "tests/test_models/test_engine/test_records.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(records.__doc__) >= 1)
+
+    def test_functions_docstring(self):
+        """Tests whether the module functions are documented"""
+        funcs = inspect.getmembers(records, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestRecords(unittest.TestCase):
+    """Test cases for the records functions"""
+
+    def setUp(self):
+        """creates test records for other tests"""
+        self.records = [{"__class__": "Place", "id": "1", "name": "a",
+                         "amenity_ids": ["x", "y"]},
+                        {"__class__": "Place", "id": "2", "name": "b"}]
+
+    def round_trip(self, fmt, fields=None):
+        """writes then reads back the test records in fmt"""
+        f = StringIO(newline='')
+        count = records.write_records(f, self.records, fmt, fields)
+        self.assertEqual(count, 2)
+        f.seek(0)
+        return list(records.read_records(f, fmt))
+
+    def test_ndjson_round_trip(self):
+        """NDJSON records read back unchanged"""
+        self.assertEqual(self.round_trip("ndjson"), self.records)
+
+    def test_csv_round_trip(self):
+        """CSV records read back with lists decoded and empty cells left
+        out"""
+        fields = ["__class__", "id", "name", "amenity_ids"]
+        self.assertEqual(self.round_trip("csv", fields), self.records)
+
+    def test_guess_format(self):
+        """the format follows the file extension"""
+        self.assertEqual(records.guess_format("a/places.CSV"), "csv")
+        self.assertEqual(records.guess_format("users.jsonl"), "ndjson")
+        with self.assertRaises(ValueError):
+            records.guess_format("file.json")
+
+    def test_coerce(self):
+        """numeric class attributes give the type of CSV values"""
+        class Place:
+            """stand-in model class"""
+            number_rooms = 0
+            latitude = 0.0
+
+        record = records.coerce(Place, {"number_rooms": "3",
+                                        "latitude": "1.5", "name": "7"})
+        self.assertEqual(record, {"number_rooms": 3, "latitude": 1.5,
+                                  "name": "7"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+"""Module test_rwlock
+
+This Module contains a tests for ReadWriteLock Class
+"""
+
+import inspect
+import threading
+import time
+import unittest
+
+import pycodestyle
+from models.engine import rwlock
+
+ReadWriteLock = rwlock.ReadWriteLock
+
+
+class TestReadWriteLockDocsAndStyle(unittest.TestCase):
+    """Tests ReadWriteLock class for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/rwlock.py",
+                "tests/test_models/test_engine/test_rwlock.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(rwlock.__doc__) >= 1)
+
+    def test_class_docstring(self):
+        """Tests whether the class is documented"""
+        self.assertTrue(len(ReadWriteLock.__doc__) >= 1)
+
+    def test_methods_docstring(self):
+        """Tests whether the class methods are documented"""
+        funcs = inspect.getmembers(ReadWriteLock, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestReadWriteLock(unittest.TestCase):
+    """Test cases for ReadWriteLock Class"""
+
+    def setUp(self):
+        """creates a test lock for other tests"""
+        self.lock = ReadWriteLock()
+
+    def run_thread(self, target):
+        """starts a daemon thread running target and returns it"""
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        return thread
+
+    def test_readers_share(self):
+        """a reader doesn't wait for another reader"""
+        def read():
+            with self.lock.read():
+                pass
+
+        with self.lock.read():
+            thread = self.run_thread(read)
+            thread.join(1)
+            self.assertFalse(thread.is_alive())
+
+    def test_writer_excludes(self):
+        """a writer waits for the readers and readers for the writer"""
+        events = []
+
+        def write():
+            with self.lock.write():
+                events.append("write")
+
+        with self.lock.read():
+            thread = self.run_thread(write)
+            time.sleep(0.05)
+            events.append("read done")
+        thread.join(1)
+        self.assertEqual(events, ["read done", "write"])
+
+    def test_waiting_writer_blocks_new_readers(self):
+        """readers arriving after a waiting writer go after it"""
+        events = []
+
+        def write():
+            with self.lock.write():
+                events.append("write")
+
+        def read():
+            with self.lock.read():
+                events.append("read")
+
+        with self.lock.read():
+            writer = self.run_thread(write)
+            time.sleep(0.05)
+            reader = self.run_thread(read)
+            time.sleep(0.05)
+            self.assertEqual(events, [])
+        writer.join(1)
+        reader.join(1)
+        self.assertEqual(events, ["write", "read"])
+
+    def test_reentrant(self):
+        """the locks nest, and the writer may read"""
+        with self.lock.write():
+            with self.lock.write(), self.lock.read():
+                pass
+        with self.lock.read(), self.lock.read():
+            with self.assertRaises(RuntimeError):
+                self.lock.acquire_write()
+        with self.lock.write():
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+"""Module test_stream
+
+This Module contains a tests for the stream module
+"""
+
+import inspect
+import json
+import unittest
+from io import BytesIO, StringIO
+
+import pycodestyle
+from models.engine import stream
+
+
+class TestStreamDocsAndStyle(unittest.TestCase):
+    """Tests stream module for documentation and style conformance"""
+
+    def test_pycodestyle(self):
+        """Tests compliance with pycodestyle"""
+        style = pycodestyle.StyleGuide(quiet=False)
+        result = style.check_files(
+            [
+                "models/engine/stream.py",
+                "tests/test_models/test_engine/test_stream.py"
+            ])
+        self.assertEqual(result.total_errors, 0)
+
+    def test_module_docstring(self):
+        """Tests whether the module is documented"""
+        self.assertTrue(len(stream.__doc__) >= 1)
+
+    def test_functions_docstring(self):
+        """Tests whether the module functions are documented"""
+        funcs = inspect.getmembers(stream, inspect.isfunction)
+        for func in funcs:
+            self.assertTrue(len(func[1].__doc__) >= 1)
+
+
+class TestIterEntries(unittest.TestCase):
+    """Test cases for iter_entries"""
+
+    def setUp(self):
+        """creates test entries for other tests"""
+        self.entries = {f"BaseModel.{i}": {"id": str(i), "n": i * 1.5,
+                                           "text": "x" * i, "list": [i]}
+                        for i in range(50)}
+
+    def test_reads_entries_across_small_chunks(self):
+        """entries split across reads are decoded whole"""
+        f = StringIO(json.dumps(self.entries))
+        self.assertEqual(dict(stream.iter_entries(f, chunk_size=7)),
+                         self.entries)
+
+    def test_reads_indented_file(self):
+        """whitespace and newlines between tokens are skipped"""
+        f = StringIO(json.dumps(self.entries, indent=4))
+        self.assertEqual(dict(stream.iter_entries(f, chunk_size=16)),
+                         self.entries)
+
+    def test_empty_object(self):
+        """an empty object yields nothing"""
+        self.assertEqual(list(stream.iter_entries(StringIO(" { } "))), [])
+
+    def test_invalid_input_raises(self):
+        """truncated or malformed files raise a JSONDecodeError"""
+        for text in ('{"a": {"id": 1}', '{"a" {}}', '[1]', '{1: 2}'):
+            with self.assertRaises(json.JSONDecodeError):
+                list(stream.iter_entries(StringIO(text), chunk_size=4))
+
+
+class TestWriteEntries(unittest.TestCase):
+    """Test cases for dump_entry and write_entries"""
+
+    def test_written_object_reads_back(self):
+        """the written text is a JSON object holding every entry"""
+        entries = {f"BaseModel.{i}": {"id": str(i)} for i in range(20)}
+        f = StringIO()
+        stream.write_entries(
+            f, (stream.dump_entry(k, v) for k, v in entries.items()),
+            buffer_size=10)
+        self.assertEqual(json.loads(f.getvalue()), entries)
+        self.assertEqual(len(f.getvalue().splitlines()), 22)
+
+    def test_no_entries(self):
+        """an empty iterable writes an empty object"""
+        f = StringIO()
+        stream.write_entries(f, iter(()))
+        self.assertEqual(json.loads(f.getvalue()), {})
+
+
+class TestLineRanges(unittest.TestCase):
+    """Test cases for line_ranges and iter_range"""
+
+    def write(self, entries):
+        """returns a binary file holding entries as write_entries does"""
+        f = StringIO()
+        stream.write_entries(
+            f, (stream.dump_entry(k, v) for k, v in entries.items()))
+        return BytesIO(f.getvalue().encode("utf-8"))
+
+    def read(self, f, ranges):
+        """returns the entries of every range of f, in order"""
+        return [item for start, end in ranges
+                for item in stream.iter_range(f, start, end)]
+
+    def test_ranges_cover_every_entry(self):
+        """the ranges hold every entry once, whatever their number"""
+        entries = {f"BaseModel.{i}": {"id": str(i), "text": "é" * i}
+                   for i in range(30)}
+        f = self.write(entries)
+        for parts in (1, 4, 7, 100):
+            ranges = stream.line_ranges(f, parts)
+            self.assertLessEqual(len(ranges), max(parts, 1))
+            self.assertEqual(self.read(f, ranges), list(entries.items()))
+
+    def test_empty_object(self):
+        """an empty object yields nothing"""
+        f = self.write({})
+        self.assertEqual(self.read(f, stream.line_ranges(f, 3)), [])
+
+    def test_one_line_file(self):
+        """a file not written one entry per line can't be split"""
+        f = BytesIO(json.dumps({"a": {"id": 1}}).encode("utf-8"))
+        self.assertIsNone(stream.line_ranges(f, 2))
+        f = BytesIO(json.dumps({"a": {"id": 1}}, indent=4).encode("utf-8"))
+        self.assertIsNone(stream.line_ranges(f, 2))
+
+
+class TestWriteListing(unittest.TestCase):
+    """Test cases for write_listing"""
+
+    def test_same_as_print(self):
+        """the listing is what print would write for the list of str"""
+        for objects in ([], ["a"], ["it's", 1, {"b": [2]}] * 50):
+            expected, out = StringIO(), StringIO()
+            print([str(obj) for obj in objects], file=expected)
+            stream.write_listing(out, iter(objects), buffer_size=16)
+            self.assertEqual(out.getvalue(), expected.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()